@@ -19,10 +19,10 @@ Functions:
 
 Example:
     >>> from src.agent import QuestionExtractionAgent
-    >>> 
+    >>>
     >>> # Create agent with short-term memory
     >>> agent = QuestionExtractionAgent()
-    >>> 
+    >>>
     >>> # Multi-turn conversation (agent remembers context)
     >>> response = agent.chat("提取 test.jpg 中的选择题")
     >>> print(response)
@@ -30,23 +30,27 @@ Example:
     >>> print(response)
     >>> response = agent.chat("保存为Word文档")  # Saves the validated questions
     >>> print(response)
-    >>> 
+    >>>
     >>> # Start a new conversation (clear memory)
     >>> agent.new_conversation()
 """
 
-from .agent import (
-    QuestionExtractionAgent,
-    create_question_extraction_agent,
-    extract_questions,
-)
-from .prompts import (
-    get_system_prompt,
-    SYSTEM_PROMPT,
-    SYSTEM_PROMPT_ZH,
-    SYSTEM_PROMPT_EN,
-)
+import importlib
 
+# Lazy re-exports (PEP 562): importing src.agent pulls in langchain,
+# langchain_openai, and langgraph transitively, costing hundreds of ms of
+# cold-start time. Resolving symbols on first attribute access keeps entry
+# points that never touch the agent (e.g. --help) fast.
+_LAZY_IMPORTS = {
+    "QuestionExtractionAgent": ".agent",
+    "create_question_extraction_agent": ".agent",
+    "extract_questions": ".agent",
+    "aextract_questions": ".agent",
+    "get_system_prompt": ".prompts",
+    "SYSTEM_PROMPT": ".prompts",
+    "SYSTEM_PROMPT_ZH": ".prompts",
+    "SYSTEM_PROMPT_EN": ".prompts",
+}
 
 __all__ = [
     # Agent class
@@ -54,9 +58,27 @@ __all__ = [
     # Factory functions
     "create_question_extraction_agent",
     "extract_questions",
+    "aextract_questions",
     # Prompts
     "get_system_prompt",
     "SYSTEM_PROMPT",
     "SYSTEM_PROMPT_ZH",
     "SYSTEM_PROMPT_EN",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve a lazily exported symbol on first access."""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so subsequent accesses skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
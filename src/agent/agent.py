@@ -12,16 +12,38 @@ The agent can:
 - Remember conversation context within a session
 """
 
+import asyncio
+import itertools
+import json
 import uuid
+from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
 from typing import Optional, Union
 
+import httpx
+
+try:
+    # h2 enables HTTP/2 request multiplexing over a single connection;
+    # without it the shared pool still amortizes TLS handshakes over HTTP/1.1
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _HTTP2_AVAILABLE = False
+
 from langchain.agents import create_agent
-from langchain.agents.middleware import ContextEditingMiddleware, ClearToolUsesEdit
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ClearToolUsesEdit,
+    ContextEditingMiddleware,
+)
 from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
 from langchain.agents.structured_output import ToolStrategy
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langgraph.checkpoint.memory import InMemorySaver
+from pydantic import ValidationError
 
 from ..models.config import get_settings
 from ..models.questions import AgentResponse
@@ -29,6 +51,443 @@ from ..tools import get_all_tools
 from .prompts import get_system_prompt, SYSTEM_PROMPT
 
 
+# Process-unique tag + monotonic counter for internally generated thread ids.
+# uuid4 reads urandom per call, which is measurable when batch paths mint one
+# thread per prompt; a counter behind one process-level uuid stays unique
+# without the syscall.
+_PROCESS_TAG = uuid.uuid4().hex[:8]
+_THREAD_COUNTER = itertools.count()
+
+
+def _next_thread_id() -> str:
+    """Generate a cheap process-unique conversation thread id."""
+    return f"{_PROCESS_TAG}-{next(_THREAD_COUNTER)}"
+
+
+def _user_input(message: str) -> dict:
+    """Build the graph input for a single user message.
+
+    One construction site for the input shape; the graph takes ownership of
+    the dicts, so these are deliberately fresh per call rather than a shared
+    mutable template (which would race under batch/async dispatch).
+    """
+    return {"messages": [{"role": "user", "content": message}]}
+
+
+# Parallel tool calls (and graph branches) allowed per agent turn. LangGraph's
+# tool node fans independent calls out through the config executor, so when the
+# model emits several analyze_image calls in one turn they run concurrently;
+# this bounds the fan-out to stay under provider rate limits.
+MAX_TOOL_CONCURRENCY = 5
+
+# Input-token threshold that triggers pruning of old tool results
+CONTEXT_TRIM_TRIGGER_TOKENS = 8192
+
+# Most recent tool results preserved when the trim fires
+CONTEXT_TRIM_KEEP_TOOL_RESULTS = 8
+
+# Rough tokens-per-character rates for the trim trigger. CJK text tokenizes
+# to roughly 2 characters per token while ASCII runs about 4; the built-in
+# approximate counter assumes ASCII-like text and badly misjudges Chinese
+# prompts, firing prunes too early or too late.
+_CJK_TOKEN_RATE = 0.5
+_ASCII_TOKEN_RATE = 0.25
+
+
+def _estimate_text_tokens(text: str) -> float:
+    """Estimate the token count of a text span, weighting CJK characters."""
+    cjk_chars = sum(1 for ch in text if "\u4e00" <= ch <= "\u9fff")
+    return _CJK_TOKEN_RATE * cjk_chars + _ASCII_TOKEN_RATE * (len(text) - cjk_chars)
+
+
+def count_tokens_cjk(messages) -> int:
+    """Estimate total tokens for a message list with CJK-aware weighting.
+
+    Used as the ContextEditingMiddleware token counter so the trim trigger
+    tracks the real prompt size for Chinese conversations.
+    """
+    # Local aliases: LOAD_FAST instead of per-iteration LOAD_GLOBAL in the
+    # per-message loop below
+    estimate = _estimate_text_tokens
+    total = 0.0
+    for message in messages:
+        # Direct attribute load: every BaseMessage carries content, and the
+        # getattr fallback paid a needless default-handling branch per message
+        content = message.content
+        if isinstance(content, str):
+            total += estimate(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, str):
+                    total += estimate(part)
+                elif isinstance(part, dict) and isinstance(part.get("text"), str):
+                    total += estimate(part["text"])
+    return int(total)
+
+
+# Connection pool sizing for the shared HTTP clients below
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+class _LoopBoundAsyncClient(httpx.AsyncClient):
+    """AsyncClient whose connection pool follows the running event loop.
+
+    httpx binds keep-alive connections to the loop that opened them, so a
+    process-wide cached client breaks as soon as a second asyncio.run()
+    tries to reuse connections from the first, closed loop ("RuntimeError:
+    Event loop is closed"). The cached chat model holds one client object,
+    so instead of caching one pool we route every send() through a delegate
+    client keyed by the running loop, opening a fresh pool the first time a
+    new loop calls in and dropping pools stranded on closed loops.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._delegate_kwargs = kwargs
+        self._delegates: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    async def send(self, request, **kwargs):
+        # All request entrypoints (request/stream/get/post and the openai
+        # SDK's direct send calls) funnel through send, so delegating here
+        # covers every code path.
+        loop = asyncio.get_running_loop()
+        delegate = self._delegates.get(loop)
+        if delegate is None:
+            for stale in [done for done in self._delegates if done.is_closed()]:
+                del self._delegates[stale]
+            delegate = self._delegates[loop] = httpx.AsyncClient(**self._delegate_kwargs)
+        return await delegate.send(request, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _shared_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Build the HTTP clients shared by all OpenAI-compatible chat models.
+
+    A fresh ChatOpenAI otherwise creates its own httpx client, paying a
+    TCP+TLS handshake per agent configuration. One shared keep-alive pool
+    (HTTP/2 multiplexed when h2 is installed) amortizes that across every
+    model call. The async client binds its pools per event loop so repeated
+    asyncio.run() calls each get live connections.
+    """
+    return (
+        httpx.Client(http2=_HTTP2_AVAILABLE, limits=_HTTP_LIMITS),
+        _LoopBoundAsyncClient(http2=_HTTP2_AVAILABLE, limits=_HTTP_LIMITS),
+    )
+
+
+class LRUInMemorySaver(InMemorySaver):
+    """InMemorySaver that evicts the least-recently-used threads.
+
+    InMemorySaver keeps every checkpoint for every thread forever, so a
+    long-running process that keeps starting new conversations grows its
+    memory without bound. This caps retention to the ``max_threads`` most
+    recently written threads; older conversations are dropped whole.
+    """
+
+    def __init__(self, max_threads: int = 128, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._thread_order: OrderedDict[str, None] = OrderedDict()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = config["configurable"]["thread_id"]
+        self._thread_order[thread_id] = None
+        self._thread_order.move_to_end(thread_id)
+        while len(self._thread_order) > self.max_threads:
+            oldest, _ = self._thread_order.popitem(last=False)
+            self.delete_thread(oldest)
+
+        return result
+
+
+# Stand-in content for tool results superseded by a later identical call
+_DUPLICATE_TOOL_OUTPUT_PLACEHOLDER = "[duplicate tool output cleared; see the latest call]"
+
+
+class DeduplicateToolOutputMiddleware(AgentMiddleware):
+    """Collapse older duplicate tool outputs before each model call.
+
+    When the agent loop re-runs a tool with identical arguments (retries,
+    re-prompts, or re-scanning the same image), every copy of the multi-KB
+    result stays in context even though only the newest one carries
+    information. This hook keeps the latest result per (tool name, args)
+    pair and rewrites earlier copies to a one-line placeholder, so both the
+    model prompt and the token count seen by ContextEditingMiddleware
+    reflect the deduplicated size.
+    """
+
+    def before_model(self, state, runtime=None):
+        messages = state["messages"]
+
+        # A duplicate needs at least two call/result pairs; skip the scan
+        # entirely during the short sessions that dominate interactive use
+        if len(messages) < 4:
+            return None
+
+        # Single fused pass: a ToolMessage always follows the AIMessage that
+        # requested it, so fingerprints from tool calls are in hand by the
+        # time the matching result shows up. Tool results are indexed by
+        # fingerprint, oldest first, and duplicates fall out as list tails.
+        fingerprints: dict[str, tuple[str, str]] = {}
+        occurrences: dict[tuple[str, str], list[ToolMessage]] = {}
+        # Local aliases keep the per-message type checks on LOAD_FAST
+        ai_message, tool_message = AIMessage, ToolMessage
+        for message in messages:
+            if isinstance(message, ai_message):
+                for call in message.tool_calls:
+                    fingerprints[call["id"]] = (
+                        call.get("name", ""),
+                        json.dumps(call.get("args") or {}, sort_keys=True, default=str),
+                    )
+            elif isinstance(message, tool_message):
+                fingerprint = fingerprints.get(message.tool_call_id)
+                if fingerprint is not None:
+                    occurrences.setdefault(fingerprint, []).append(message)
+
+        # Rewrite everything but the newest copy in place (same message id
+        # replaces the original through the add_messages reducer); callers
+        # can pin a result with additional_kwargs["protected"]
+        replacements = [
+            duplicate.model_copy(update={"content": _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER})
+            for copies in occurrences.values()
+            for duplicate in copies[:-1]
+            if duplicate.content != _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER
+            and not duplicate.additional_kwargs.get("protected")
+        ]
+
+        if replacements:
+            return {"messages": replacements}
+        return None
+
+
+# Characters kept at each end of a tool result in the trim zone
+ZONE_TRIM_EXCERPT_CHARS = 200
+
+
+class ZonedToolResultMiddleware(AgentMiddleware):
+    """Progressively degrade old tool results by recency zone.
+
+    Uniform keep-N retention treats a tool result from 200 messages ago
+    the same as one from the last turn. This middleware ranks tool results
+    newest-first and degrades them by zone instead: the newest
+    ``protect_recent`` stay untouched, the next ``trim_zone`` are cut to
+    head/tail excerpts, and everything older is masked down to a one-line
+    placeholder. Masking is used even for the oldest results instead of
+    removal: deleting a ToolMessage would orphan the AIMessage tool call
+    that requested it, which providers reject, and keeping the reasoning
+    trace while masking observations is what preserves task completion on
+    resumed batches. Only ToolMessages are touched; the system prompt and
+    the conversational turns around it always survive.
+
+    The degradation cut advances in ``advance_step`` batches rather than
+    per result, so the prompt prefix stays byte-stable (and provider
+    prompt caching keeps hitting) between advances.
+    """
+
+    def __init__(
+        self,
+        protect_recent: int = 5,
+        trim_zone: int = 15,
+        advance_step: int = 4,
+    ):
+        super().__init__()
+        self.protect_recent = protect_recent
+        self.trim_zone = trim_zone
+        self.advance_step = advance_step
+
+    def _trim(self, message: ToolMessage):
+        """Cut a tool result down to head/tail excerpts, if worthwhile."""
+        content = message.content
+        if not isinstance(content, str) or len(content) <= 2 * ZONE_TRIM_EXCERPT_CHARS:
+            return None
+        excerpt = (
+            content[:ZONE_TRIM_EXCERPT_CHARS]
+            + "\n...[trimmed]...\n"
+            + content[-ZONE_TRIM_EXCERPT_CHARS:]
+        )
+        # Re-trimming an excerpt reproduces itself; skip the no-op update
+        if excerpt == content:
+            return None
+        return message.model_copy(update={"content": excerpt})
+
+    def _mask(self, message: ToolMessage):
+        """Replace a tool result body with a one-line placeholder."""
+        placeholder = f"[{message.name or 'tool'} output archived]"
+        if message.content == placeholder:
+            return None
+        return message.model_copy(update={"content": placeholder})
+
+    def before_model(self, state, runtime=None):
+        messages = state["messages"]
+
+        # Tool results can't outnumber messages, so a history at or under
+        # the protected count has nothing to degrade — skip the walk
+        if len(messages) <= self.protect_recent:
+            return None
+
+        # Local alias keeps the per-message type check on LOAD_FAST.
+        # Only ToolMessages are ever candidates — the system prompt and
+        # conversational turns are excluded by type here, and callers can
+        # additionally pin a result with additional_kwargs["protected"].
+        tool_message = ToolMessage
+        tool_results = [
+            m
+            for m in messages
+            if isinstance(m, tool_message) and not m.additional_kwargs.get("protected")
+        ]
+
+        overflow = len(tool_results) - self.protect_recent
+        if overflow <= 0:
+            return None
+
+        # Every rewrite invalidates the provider's cached prompt prefix from
+        # that message onward, so the degradation cut advances in fixed
+        # steps: between advances the history stays byte-identical and the
+        # prefix cache keeps hitting, instead of re-busting the cache on
+        # every new tool result.
+        cut = (overflow // self.advance_step) * self.advance_step
+
+        updates = []
+        for age, message in enumerate(tool_results):  # oldest first
+            if age >= cut:
+                break
+            if age < cut - self.trim_zone:
+                replacement = self._mask(message)
+            else:
+                replacement = self._trim(message)
+            if replacement is not None:
+                updates.append(replacement)
+
+        if updates:
+            return {"messages": updates}
+        return None
+
+
+# Structured-output strategy built once at import: ToolStrategy derives the
+# JSON schema from the pydantic model, which is wasteful to redo per agent
+_STRUCTURED_STRATEGY = ToolStrategy(AgentResponse)
+
+
+class CJKContextEditingMiddleware(ContextEditingMiddleware):
+    """ContextEditingMiddleware that measures prompts with count_tokens_cjk.
+
+    The released middleware only offers its built-in "approximate" and
+    "model" counters, so this subclass re-implements the wrap step to hand
+    the configured edits the CJK-aware estimator instead; everything else
+    (edit strategies, placeholder rewriting) is inherited unchanged.
+    """
+
+    @staticmethod
+    def _apply_edits(request, edits):
+        edited_messages = deepcopy(list(request.messages))
+        for edit in edits:
+            edit.apply(edited_messages, count_tokens=count_tokens_cjk)
+        return request.override(messages=edited_messages)
+
+    def wrap_model_call(self, request, handler):
+        """Apply context edits before invoking the model via handler."""
+        if not request.messages:
+            return handler(request)
+        return handler(self._apply_edits(request, self.edits))
+
+    async def awrap_model_call(self, request, handler):
+        """Apply context edits before invoking the model (async version)."""
+        if not request.messages:
+            return await handler(request)
+        return await handler(self._apply_edits(request, self.edits))
+
+
+# Default middleware stack shared by every compiled agent. Every entry is
+# stateless per-run, so one set of pydantic-validated instances serves all
+# configurations instead of being rebuilt per compile. Dedup runs first so
+# the later stages already see the reduced sizes; zone-based pruning then
+# degrades old tool results by recency, and ClearToolUsesEdit clears what
+# remains when the token trigger fires, evaluated by the CJK-aware counter
+# so Chinese conversations are measured accurately.
+_DEFAULT_MIDDLEWARE = [
+    DeduplicateToolOutputMiddleware(),
+    ZonedToolResultMiddleware(),
+    CJKContextEditingMiddleware(
+        edits=[
+            ClearToolUsesEdit(
+                trigger=CONTEXT_TRIM_TRIGGER_TOKENS,
+                keep=CONTEXT_TRIM_KEEP_TOOL_RESULTS,
+                clear_tool_inputs=True,
+            ),
+        ],
+    ),
+]
+
+
+# Checkpointer shared by agents created with the default settings. Conversations
+# are isolated by their UUID thread_id, so instances can safely share one saver,
+# and a stable checkpointer lets the compiled-agent cache below actually hit.
+_DEFAULT_CHECKPOINTER = InMemorySaver()
+
+
+@lru_cache(maxsize=8)
+def _build_compiled_agent(
+    provider: str,
+    model_name: str,
+    api_key: Optional[str],
+    base_url: Optional[str],
+    temperature: float,
+    system_prompt: str,
+    use_structured_output: bool,
+    checkpointer: Optional[object],
+):
+    """
+    Build (and cache) the model and compiled agent for a configuration.
+
+    create_agent compiles a LangGraph graph, a heavy step that dominates
+    startup for short-lived entrypoints like extract_questions(). Caching on
+    the configuration values amortizes the compile across agent instances.
+
+    Returns:
+        Tuple of (chat model, compiled agent)
+    """
+    # Configure LLM
+    if provider == "anthropic":
+        model = ChatAnthropic(
+            model=model_name,
+            api_key=api_key,
+            anthropic_api_url=base_url,
+            temperature=temperature,
+        )
+    else:
+        http_client, http_async_client = _shared_http_clients()
+        model = ChatOpenAI(
+            model=model_name,
+            api_key=api_key,
+            base_url=base_url,
+            temperature=temperature,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            ### workaroud https://github.com/langchain-ai/langchain/issues/34124#issuecomment-3586763122
+            use_responses_api=True,
+            use_previous_response_id=True
+        )
+
+    # Create the agent using LangChain's create_agent
+    # This builds a ReAct agent that runs on LangGraph
+    # Use ToolStrategy for structured output to ensure stable responses
+    agent_kwargs = {
+        "model": model,
+        "tools": get_all_tools(),
+        "system_prompt": system_prompt,
+        "checkpointer": checkpointer,
+        "middleware": _DEFAULT_MIDDLEWARE,
+    }
+
+    if use_structured_output:
+        # ToolStrategy uses tool calling to generate structured output
+        # This works with any model that supports tool calling (including Doubao)
+        agent_kwargs["response_format"] = _STRUCTURED_STRATEGY
+
+    return model, create_agent(**agent_kwargs)
+
 
 class QuestionExtractionAgent:
     """
@@ -66,6 +525,7 @@ class QuestionExtractionAgent:
         use_structured_output: bool = True,
         checkpointer: Optional[object] = "default",
         provider: Optional[str] = None,
+        secure_thread_ids: bool = False,
     ):
         """
         Initialize the Question Extraction Agent.
@@ -78,82 +538,97 @@ class QuestionExtractionAgent:
             system_prompt: Custom system prompt (defaults to built-in prompt)
             language: Language for default prompt ('zh' or 'en')
             use_structured_output: Whether to use structured output format (default True)
-            checkpointer: Checkpointer for memory (defaults to InMemorySaver, set to None to disable)
+            checkpointer: Checkpointer for memory (defaults to InMemorySaver;
+                          "lru" bounds retained threads, None disables memory)
             provider: LLM provider ('openai', 'anthropic', etc.)
+            secure_thread_ids: Use full UUIDs for generated thread ids when
+                               they must be unguessable (default False)
         """
         settings = get_settings()
         self.provider = provider or settings.agent_provider
-        
-        # Configure LLM
+
         if self.provider == "anthropic":
-            self.model = ChatAnthropic(
-                model=model_name or settings.agent_model,
-                api_key=api_key or settings.anthropic_api_key,
-                anthropic_api_url=base_url or settings.agent_base_url,
-                temperature=temperature if temperature is not None else settings.agent_temperature,
-            )
+            resolved_api_key = api_key or settings.anthropic_api_key
         else:
-            self.model = ChatOpenAI(
-                model=model_name or settings.agent_model,
-                api_key=api_key or settings.effective_agent_api_key,
-                base_url=base_url or settings.agent_base_url,
-                temperature=temperature if temperature is not None else settings.agent_temperature,
-                ### workaroud https://github.com/langchain-ai/langchain/issues/34124#issuecomment-3586763122
-                use_responses_api=True,
-                use_previous_response_id=True
-            )
-        
+            resolved_api_key = api_key or settings.effective_agent_api_key
+
         # Get tools
         self.tools = get_all_tools()
-        
+
         # Configure system prompt
         self.system_prompt = system_prompt or get_system_prompt(language)
-        
-        # Create checkpointer for short-term memory
-        # InMemorySaver stores conversation history in memory
-        # This enables multi-turn conversations within a session
+
+        # Checkpointer for short-term memory: conversation history within a
+        # session. The default is a module-level InMemorySaver shared across
+        # instances (threads are isolated by UUID), keeping the compiled-agent
+        # cache effective; "lru" bounds retention for long-running processes;
+        # pass None to disable memory entirely.
         if checkpointer == "default":
-            self.checkpointer = InMemorySaver()
+            self.checkpointer = _DEFAULT_CHECKPOINTER
+        elif checkpointer == "lru":
+            self.checkpointer = LRUInMemorySaver(max_threads=settings.checkpoint_lru_size)
         else:
             self.checkpointer = checkpointer
-        
+
         # Store structured output preference
         self.use_structured_output = use_structured_output
 
-        # Configure middleware to manage context window
-        # ClearToolUsesEdit removes old tool outputs to save tokens
-        # ContextCleanupMiddleware removes specific tool messages after checkpoints:
-        #   - Remove analyze_image messages after save_questions_json
-        #   - Remove save_questions_json messages after batch_process_images
-        middleware = [
-        ]
-        
-        # Create the agent using LangChain's create_agent
-        # This builds a ReAct agent that runs on LangGraph
-        # Use ToolStrategy for structured output to ensure stable responses
-        agent_kwargs = {
-            "model": self.model,
-            "tools": self.tools,
-            "system_prompt": self.system_prompt,
-            "checkpointer": self.checkpointer,
-            "middleware": middleware,
-        }
-        
-        if use_structured_output:
-            # ToolStrategy uses tool calling to generate structured output
-            # This works with any model that supports tool calling (including Doubao)
-            agent_kwargs["response_format"] = ToolStrategy(AgentResponse)
-        
-        self.agent = create_agent(**agent_kwargs)
-        
+        # Reuse the compiled graph for identical configurations; compiling is
+        # by far the most expensive part of constructing an agent
+        self.model, self.agent = _build_compiled_agent(
+            self.provider,
+            model_name or settings.agent_model,
+            resolved_api_key,
+            base_url or settings.agent_base_url,
+            temperature if temperature is not None else settings.agent_temperature,
+            self.system_prompt,
+            use_structured_output,
+            self.checkpointer,
+        )
+
+        # Store thread id generation preference
+        self.secure_thread_ids = secure_thread_ids
+
         # Initialize thread ID for conversation tracking
         self._thread_id: Optional[str] = None
+
+        # Most recent (thread_id, config) pair; a chat loop hits the same
+        # thread on every turn, so the config dict is built once per thread
+        # instead of once per call
+        self._last_run_config: tuple[Optional[str], Optional[dict]] = (None, None)
     
+    def _run_config(self, thread_id: str) -> dict:
+        """Build the invoke/stream config for a conversation thread.
+
+        max_concurrency sizes the executor LangGraph uses to run independent
+        tool calls from a single model turn in parallel; without it a turn
+        with N tool calls pays their latencies back to back.
+
+        The returned dict is cached per thread and never mutated after
+        construction (the graph copies it via ensure_config), so repeat
+        turns on one conversation reuse the same object.
+        """
+        cached_thread_id, cached_config = self._last_run_config
+        if cached_thread_id == thread_id:
+            return cached_config
+        config = {
+            "configurable": {"thread_id": thread_id},
+            "max_concurrency": MAX_TOOL_CONCURRENCY,
+        }
+        self._last_run_config = (thread_id, config)
+        return config
+
+    def _generate_thread_id(self) -> str:
+        """Generate a thread id per the agent's security preference."""
+        if self.secure_thread_ids:
+            return str(uuid.uuid4())
+        return _next_thread_id()
+
     @property
     def thread_id(self) -> str:
         """Get or create the current thread ID."""
         if self._thread_id is None:
-            self._thread_id = str(uuid.uuid4())
+            self._thread_id = self._generate_thread_id()
         return self._thread_id
     
     def new_conversation(self) -> str:
@@ -163,7 +638,7 @@ class QuestionExtractionAgent:
         Returns:
             New thread ID
         """
-        self._thread_id = str(uuid.uuid4())
+        self._thread_id = self._generate_thread_id()
         return self._thread_id
     
     def chat(
@@ -197,39 +672,79 @@ class QuestionExtractionAgent:
         
         # Invoke the agent with message and thread configuration
         result = self.agent.invoke(
-            {"messages": [{"role": "user", "content": message}]},
-            config={"configurable": {"thread_id": current_thread_id}},
+            _user_input(message),
+            config=self._run_config(current_thread_id),
         )
-        
+
+        return self._parse_chat_result(result)
+
+    async def achat(
+        self,
+        message: str,
+        thread_id: Optional[str] = None,
+    ) -> Union[str, AgentResponse]:
+        """
+        Async variant of chat().
+
+        Awaits the graph's native ainvoke directly instead of blocking a
+        thread, so callers can fan out multiple conversations with
+        asyncio.gather.
+
+        Args:
+            message: User message
+            thread_id: Optional thread ID for conversation (uses current if not provided)
+
+        Returns:
+            If use_structured_output is True: AgentResponse object
+            Otherwise: Agent response as string
+        """
+        current_thread_id = thread_id or self.thread_id
+
+        result = await self.agent.ainvoke(
+            _user_input(message),
+            config=self._run_config(current_thread_id),
+        )
+
+        return self._parse_chat_result(result)
+
+    def _parse_chat_result(self, result: dict) -> Union[str, AgentResponse]:
+        """Extract the user-facing response from a raw agent result."""
         # If using structured output, return the structured response
-        if self.use_structured_output and "structured_response" in result:
-            structured_response = result["structured_response"]
+        # (single .get instead of a membership test plus a second lookup)
+        if self.use_structured_output:
+            structured_response = result.get("structured_response")
             if structured_response is not None:
                 return structured_response
         
         # Fallback: Extract the final response from the agent
         # The result contains a list of messages, we want the last AI message
-        messages = result.get("messages", [])
+        # Tuple sentinel instead of a default [] that would allocate a fresh
+        # empty list on every parse
+        messages = result.get("messages") or ()
         if messages:
             last_message = messages[-1]
-            # Handle different message types
-            if hasattr(last_message, "content"):
+            # Fast C-level type check instead of hasattr, which walks the
+            # pydantic descriptor machinery on every fallback parse
+            if isinstance(last_message, BaseMessage):
+                content = last_message.content
                 # If structured output was expected but not found, try to parse the content
                 if self.use_structured_output:
-                    try:
-                        import json
-                        content = last_message.content
-                        if isinstance(content, str):
-                            data = json.loads(content)
-                            return AgentResponse(**data)
-                    except (json.JSONDecodeError, TypeError, ValueError):
-                        # If parsing fails, return a default structured response
-                        return AgentResponse(
-                            success=True,
-                            message=last_message.content,
-                            operation="chat"
-                        )
-                return last_message.content
+                    # Only AI turns can carry the structured payload; skip
+                    # the JSON re-parse for tool or system messages
+                    if isinstance(last_message, AIMessage) and isinstance(content, str):
+                        try:
+                            # Parses and validates in one pydantic-core pass,
+                            # skipping the intermediate json.loads dict
+                            return AgentResponse.model_validate_json(content)
+                        except ValidationError:
+                            pass
+                    # If parsing fails, return a default structured response
+                    return AgentResponse(
+                        success=True,
+                        message=content,
+                        operation="chat"
+                    )
+                return content
             return str(last_message)
         
         # Return appropriate type based on structured output setting
@@ -260,59 +775,141 @@ class QuestionExtractionAgent:
             Full result dictionary from the agent
         """
         current_thread_id = thread_id or self.thread_id
-        
+
         return self.agent.invoke(
-            {"messages": [{"role": "user", "content": message}]},
-            config={"configurable": {"thread_id": current_thread_id}},
+            _user_input(message),
+            config=self._run_config(current_thread_id),
         )
-    
+
+    def _batch_inputs(
+        self,
+        messages: list[str],
+        thread_ids: Optional[list[str]] = None,
+    ) -> tuple[list[dict], list[dict]]:
+        """Build per-message inputs and configs for batch dispatch."""
+        if thread_ids is None:
+            # Independent conversations by default: each prompt gets its own thread
+            thread_ids = [self._generate_thread_id() for _ in messages]
+        elif len(thread_ids) != len(messages):
+            raise ValueError("thread_ids must match messages in length")
+
+        inputs = [_user_input(m) for m in messages]
+        configs = [self._run_config(tid) for tid in thread_ids]
+        return inputs, configs
+
+    def batch(
+        self,
+        messages: list[str],
+        thread_ids: Optional[list[str]] = None,
+    ) -> list[Union[str, AgentResponse]]:
+        """
+        Process multiple messages concurrently.
+
+        Dispatches through the compiled graph's batch, which runs the
+        prompts with inflight parallelism: N prompts complete in roughly
+        the latency of the slowest one instead of their sum.
+
+        Args:
+            messages: User messages, one per conversation
+            thread_ids: Optional thread IDs, one per message (auto-generated
+                        UUIDs when not provided)
+
+        Returns:
+            One parsed response per message, in input order
+        """
+        inputs, configs = self._batch_inputs(messages, thread_ids)
+        results = self.agent.batch(inputs, config=configs)
+        return [self._parse_chat_result(result) for result in results]
+
+    async def abatch(
+        self,
+        messages: list[str],
+        thread_ids: Optional[list[str]] = None,
+    ) -> list[Union[str, AgentResponse]]:
+        """
+        Async variant of batch().
+
+        Args:
+            messages: User messages, one per conversation
+            thread_ids: Optional thread IDs, one per message (auto-generated
+                        UUIDs when not provided)
+
+        Returns:
+            One parsed response per message, in input order
+        """
+        inputs, configs = self._batch_inputs(messages, thread_ids)
+        results = await self.agent.abatch(inputs, config=configs)
+        return [self._parse_chat_result(result) for result in results]
+
     def stream(
         self,
         message: str,
         thread_id: Optional[str] = None,
+        stream_mode="updates",
     ):
         """
         Stream the agent response.
-        
+
         Yields chunks of the agent's response as they are generated.
-        
+
         Args:
             message: User message
             thread_id: Optional thread ID for conversation
-            
+            stream_mode: LangGraph stream mode(s). The default "updates"
+                         streams each node's delta (new messages only)
+                         instead of the full-state snapshot per step,
+                         keeping memory O(delta) even when tool outputs
+                         are large. Pass a list such as
+                         ["updates", "messages"] to additionally receive
+                         per-token LLM chunks; chunks then arrive as
+                         (mode, payload) tuples.
+
         Yields:
             Response chunks from the agent
         """
         current_thread_id = thread_id or self.thread_id
-        
+
         for chunk in self.agent.stream(
-            {"messages": [{"role": "user", "content": message}]},
-            config={"configurable": {"thread_id": current_thread_id}},
+            _user_input(message),
+            config=self._run_config(current_thread_id),
+            stream_mode=stream_mode,
         ):
             yield chunk
     
-    def get_conversation_history(self, thread_id: Optional[str] = None) -> list:
+    def get_conversation_history(
+        self,
+        thread_id: Optional[str] = None,
+        lite: bool = False,
+    ) -> list:
         """
         Get the conversation history for a thread.
-        
+
         Args:
             thread_id: Thread ID to get history for (uses current if not provided)
-            
+            lite: Return slim {"role", "content"} dicts instead of full
+                  message objects — cheaper to traverse and JSON-serialize
+                  for display layers that only need role and text
+
         Returns:
             List of messages in the conversation
         """
         current_thread_id = thread_id or self.thread_id
-        
+
         # Get the state from the checkpointer
         try:
             state = self.agent.get_state(
                 config={"configurable": {"thread_id": current_thread_id}}
             )
             if state and state.values:
-                return state.values.get("messages", [])
+                messages = state.values.get("messages") or []
+                if lite:
+                    return [
+                        {"role": m.type, "content": m.content} for m in messages
+                    ]
+                return messages
         except Exception:
             pass
-        
+
         return []
 
 
@@ -361,6 +958,27 @@ def create_question_extraction_agent(
     )
 
 
+@lru_cache(maxsize=4)
+def _default_extraction_agent(
+    model_name: Optional[str],
+    api_key: Optional[str],
+    use_structured_output: bool,
+    provider: Optional[str],
+) -> "QuestionExtractionAgent":
+    """Shared agent behind the single-turn convenience functions.
+
+    Reusing one agent keeps the compiled graph, the warm HTTP pool, and the
+    provider-side prefix cache for the long system prompt hot across calls
+    instead of rebuilding all three per extraction.
+    """
+    return create_question_extraction_agent(
+        model_name=model_name,
+        api_key=api_key,
+        use_structured_output=use_structured_output,
+        provider=provider,
+    )
+
+
 # Convenience function for quick single-turn interactions
 def extract_questions(
     message: str,
@@ -389,10 +1007,56 @@ def extract_questions(
     Example:
         >>> result = extract_questions("提取 test.jpg 中的题目并保存为 output.json")
     """
-    agent = create_question_extraction_agent(
-        model_name=model_name,
-        api_key=api_key,
-        use_structured_output=use_structured_output,
-        provider=provider,
-    )
-    return agent.chat(message)
+    agent = _default_extraction_agent(model_name, api_key, use_structured_output, provider)
+    # Fresh thread per call keeps single-turn semantics; the thread is
+    # deleted afterwards so the shared process-lifetime checkpointer does
+    # not retain every extraction's history
+    thread_id = _next_thread_id()
+    try:
+        return agent.chat(message, thread_id=thread_id)
+    finally:
+        if agent.checkpointer is not None:
+            agent.checkpointer.delete_thread(thread_id)
+
+
+async def aextract_questions(
+    message: str,
+    model_name: Optional[str] = None,
+    api_key: Optional[str] = None,
+    use_structured_output: bool = True,
+    provider: Optional[str] = None,
+) -> Union[str, AgentResponse]:
+    """
+    Async variant of extract_questions for concurrent batch callers.
+
+    Multiple extraction prompts can be dispatched together with
+    asyncio.gather, completing in roughly the latency of the slowest one
+    instead of their sum.
+
+    Args:
+        message: User message describing the extraction task
+        model_name: Optional LLM model name
+        api_key: Optional API key
+        use_structured_output: Whether to return structured output (default True)
+        provider: LLM provider ('openai', 'anthropic', etc.)
+
+    Returns:
+        If use_structured_output is True: AgentResponse object
+        Otherwise: Agent response string
+
+    Example:
+        >>> results = await asyncio.gather(
+        ...     aextract_questions("提取 a.jpg 中的题目"),
+        ...     aextract_questions("提取 b.jpg 中的题目"),
+        ... )
+    """
+    agent = _default_extraction_agent(model_name, api_key, use_structured_output, provider)
+    # Fresh thread per call keeps single-turn semantics; the thread is
+    # deleted afterwards so the shared process-lifetime checkpointer does
+    # not retain every extraction's history
+    thread_id = _next_thread_id()
+    try:
+        return await agent.achat(message, thread_id=thread_id)
+    finally:
+        if agent.checkpointer is not None:
+            await agent.checkpointer.adelete_thread(thread_id)
@@ -4,8 +4,12 @@ Prompt templates for the Question Extraction Agent.
 This module provides system prompts in both Chinese and English for the agent.
 """
 
-# System prompt in Chinese (primary)
-SYSTEM_PROMPT_ZH = """你是一个专业的试题提取助手。你的任务是帮助用户从图片中提取试题，并将其保存为JSON或Word格式。
+from typing import Final
+
+# System prompt in Chinese (primary). Frozen: the system prompt is the
+# cacheable prefix for provider-side prompt caching, so it must stay
+# byte-identical across agent constructions.
+SYSTEM_PROMPT_ZH: Final[str] = """你是一个专业的试题提取助手。你的任务是帮助用户从图片中提取试题，并将其保存为JSON或Word格式。
 
 ## 你的能力
 
@@ -32,7 +36,7 @@ SYSTEM_PROMPT_ZH = """你是一个专业的试题提取助手。你的任务是
 
 1. 用户提供目录
 2. 使用批量处理工具扫描目录，获取待处理图片列表
-3. 根据图片路径列表，使用 analyze_image 工具分析图片并直接保存到 JSON 文件
+3. 根据图片路径列表，在同一条回复中为每张图片分别发起 analyze_image 工具调用（并行执行，不要逐张等待结果），分析图片并直接保存到 JSON 文件
 4. 再次调用批量处理工具，检查处理状态，获取剩余待处理图片，重复步骤2-3，直到所有图片处理完毕。
 5. 验证提取结果的质量
 6. 向用户报告结果
@@ -51,7 +55,7 @@ SYSTEM_PROMPT_ZH = """你是一个专业的试题提取助手。你的任务是
 """
 
 # System prompt in English (alternative)
-SYSTEM_PROMPT_EN = """You are a professional question extraction assistant. Your task is to help users extract questions from images and save them in JSON or Word format.
+SYSTEM_PROMPT_EN: Final[str] = """You are a professional question extraction assistant. Your task is to help users extract questions from images and save them in JSON or Word format.
 
 ## Your Capabilities
 
@@ -74,7 +78,7 @@ You can use the following tools to complete tasks:
 
 1. The user provides image paths or a directory
 2. If a directory is provided, use the batch processing tool to scan the directory and get a list of images to process
-3. For each batch of image paths, use the analyze_image tool to extract questions and save directly to a JSON file
+3. For each batch of image paths, issue one analyze_image tool call per image in a single reply (they run in parallel — do not wait for each image before requesting the next), extracting questions and saving directly to a JSON file
 4. If a directory, call the batch processing tool again to check the status and get the next batch, repeat step 3 until all images are processed
 5. Validate the quality of the extracted results
 6. Report the results to the user
@@ -94,19 +98,25 @@ You can use the following tools to complete tasks:
 """
 
 # Default system prompt
-SYSTEM_PROMPT = SYSTEM_PROMPT_ZH
+SYSTEM_PROMPT: Final[str] = SYSTEM_PROMPT_ZH
+
+# Precomputed language -> prompt table: one dict hit per lookup instead of
+# branch-and-compare, and every caller receives the identical string object
+# (which also keeps it usable as a cache key upstream)
+_PROMPTS: Final[dict] = {
+    "zh": SYSTEM_PROMPT_ZH,
+    "en": SYSTEM_PROMPT_EN,
+}
 
 
 def get_system_prompt(language: str = "zh") -> str:
     """
     Get the system prompt in the specified language.
-    
+
     Args:
         language: Language code ('zh' for Chinese, 'en' for English)
-        
+
     Returns:
         System prompt string
     """
-    if language.lower() == "en":
-        return SYSTEM_PROMPT_EN
-    return SYSTEM_PROMPT_ZH
+    return _PROMPTS.get(language.lower(), SYSTEM_PROMPT_ZH)
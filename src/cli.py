@@ -13,19 +13,17 @@ Features:
 
 import os
 import sys
+import traceback
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.table import Table
-from rich.live import Live
-from rich.spinner import Spinner
 from rich.text import Text
-from rich.syntax import Syntax
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import box
 
 console = Console()
@@ -96,9 +94,9 @@ def display_token_usage(usage: dict, total_usage: dict = None):
     console.print(Panel(usage_text, title="Token Usage", border_style="dim", expand=False))
 
 
-def display_welcome():
-    """Display welcome message and help info."""
-    welcome_text = """
+# Static help text shown at startup and by /help; the rendered panel is
+# cached because the Markdown parse (headings plus a table) is the cost
+_WELCOME_TEXT = """
 # 🤖 Question Extraction Agent
 
 Welcome to the interactive chat mode! You can:
@@ -121,21 +119,48 @@ Welcome to the interactive chat mode! You can:
 
 Type your message and press Enter to chat with the agent.
 """
-    console.print(Panel(Markdown(welcome_text), title="Welcome", border_style="blue"))
 
 
-def display_memory(agent, thread_id: str):
-    """Display current conversation memory/history."""
+@lru_cache(maxsize=1)
+def _welcome_panel() -> Panel:
+    """Build the welcome panel once per process."""
+    return Panel(Markdown(_WELCOME_TEXT), title="Welcome", border_style="blue")
+
+
+def display_welcome():
+    """Display welcome message and help info."""
+    console.print(_welcome_panel())
+
+
+# Messages rendered by /memory before the older tail is elided; Rich table
+# rendering degrades badly past a few hundred rows
+MEMORY_DISPLAY_LIMIT = 50
+
+# Row color per message role in the /memory table
+_ROLE_STYLES = {
+    "user": "green",
+    "assistant": "blue",
+    "tool": "yellow",
+    "system": "magenta",
+    "human": "green",
+    "ai": "blue",
+}
+
+
+def display_memory(agent, thread_id: str, limit: int = MEMORY_DISPLAY_LIMIT):
+    """Display current conversation memory/history (most recent `limit`)."""
     try:
         history = agent.get_conversation_history(thread_id)
-        
+
         if not history:
             console.print("[yellow]No conversation history yet.[/yellow]")
             return
-        
-        console.print()
-        console.print(Panel("[bold]📝 Conversation Memory[/bold]", border_style="cyan"))
-        
+
+        total = len(history)
+        elided = total - limit if limit > 0 else 0
+        if elided > 0:
+            history = history[-limit:]
+
         table = Table(
             show_header=True,
             header_style="bold cyan",
@@ -147,66 +172,101 @@ def display_memory(agent, thread_id: str):
         table.add_column("Content", overflow="fold")
         table.add_column("Tool Info", width=25, overflow="fold")
         
-        for i, msg in enumerate(history, 1):
+        if elided > 0:
+            table.add_row("", "[dim]…[/dim]", f"[dim]{elided} earlier message(s) elided[/dim]", "")
+
+        for i, msg in enumerate(history, elided + 1):
             role = _get_message_role(msg)
-            content = _get_message_content(msg)
+            # +1 over the display cap so the ellipsis check below still fires
+            content = _get_message_content(msg, max_len=201)
             tool_info = _get_tool_info(msg)
             
             # Color code by role
-            role_style = {
-                "user": "green",
-                "assistant": "blue",
-                "tool": "yellow",
-                "system": "magenta",
-                "human": "green",
-                "ai": "blue",
-            }.get(role, "white")
+            role_style = _ROLE_STYLES.get(role, "white")
             
             table.add_row(
                 str(i),
                 f"[{role_style}]{role}[/{role_style}]",
-                content[:200] + "..." if len(content) > 200 else content,
+                _truncate(content, 200),
                 tool_info,
             )
         
-        console.print(table)
-        console.print(f"\n[dim]Total messages: {len(history)} | Thread ID: {thread_id[:8]}...[/dim]")
-        
+        # One buffered print per logical block: each console.print pays
+        # markup parsing and ANSI computation, so the header, table and
+        # footer render together instead of as four separate passes
+        console.print(Group(
+            Text(""),
+            Panel("[bold]📝 Conversation Memory[/bold]", border_style="cyan"),
+            table,
+            Text(""),
+            Text.from_markup(
+                f"[dim]Total messages: {total} | Thread ID: {thread_id[:8]}...[/dim]"
+            ),
+        ))
+
     except Exception as e:
         console.print(f"[red]Error retrieving memory: {e}[/red]")
 
 
+# Role per message class, filled lazily: the role is a class-level constant
+# for every langchain message type, so after the first instance the probe
+# chain below collapses to a single dict hit per message
+_ROLE_BY_CLASS: dict = {}
+
+
+def _compute_message_role(msg) -> str:
+    """Probe a message object for its role (slow path, once per class)."""
+    msg_type = getattr(msg, "type", None)
+    if isinstance(msg_type, str):
+        return msg_type
+    class_name = type(msg).__name__.lower()
+    for key in ("human", "ai", "tool", "system"):
+        if key in class_name:
+            return key
+    return "unknown"
+
+
 def _get_message_role(msg) -> str:
     """Extract role from message object."""
-    if hasattr(msg, "type"):
-        return msg.type
-    if hasattr(msg, "__class__"):
-        class_name = msg.__class__.__name__.lower()
-        if "human" in class_name:
-            return "human"
-        if "ai" in class_name:
-            return "ai"
-        if "tool" in class_name:
-            return "tool"
-        if "system" in class_name:
-            return "system"
-    return "unknown"
+    cls = type(msg)
+    role = _ROLE_BY_CLASS.get(cls)
+    if role is None:
+        role = _compute_message_role(msg)
+        _ROLE_BY_CLASS[cls] = role
+    return role
+
 
+def _get_message_content(msg, max_len: int = -1) -> str:
+    """Extract content from message object.
 
-def _get_message_content(msg) -> str:
-    """Extract content from message object."""
+    Args:
+        msg: Message object to extract text from
+        max_len: When >= 0, stop extracting once this many characters are
+                 collected. Display callers truncate anyway, so there is
+                 no point joining a multi-megabyte multimodal payload to
+                 show its first few hundred characters.
+    """
     if hasattr(msg, "content"):
         content = msg.content
         if isinstance(content, str):
+            if 0 <= max_len < len(content):
+                return content[:max_len]
             return content
         if isinstance(content, list):
             # Handle list content (e.g., multimodal)
             parts = []
+            collected = 0
             for item in content:
                 if isinstance(item, dict) and "text" in item:
-                    parts.append(item["text"])
+                    part = item["text"]
                 elif isinstance(item, str):
-                    parts.append(item)
+                    part = item
+                else:
+                    continue
+                parts.append(part)
+                collected += len(part)
+                if 0 <= max_len <= collected:
+                    break
             return " ".join(parts) if parts else "[Complex content]"
     return str(msg)
 
@@ -231,114 +291,154 @@ def _get_tool_info(msg) -> str:
     return "\n".join(info_parts) if info_parts else ""
 
 
+def _truncate(text: str, limit: int, suffix: str = "...") -> str:
+    """Clip `text` to `limit` characters, appending `suffix` if clipped.
+
+    Truncating before handing strings to Rich keeps its cell-width
+    measurement proportional to the display cap rather than the payload.
+    """
+    if len(text) > limit:
+        return text[:limit] + suffix
+    return text
+
+
 def display_tool_call(tool_name: str, tool_args: dict):
     """Display a tool being called."""
-    console.print()
-    console.print(f"[yellow]🔧 Calling tool:[/yellow] [bold]{tool_name}[/bold]")
-    
+    parts = [
+        Text(""),
+        Text.from_markup(f"[yellow]🔧 Calling tool:[/yellow] [bold]{tool_name}[/bold]"),
+    ]
+
     if tool_args:
         # Pretty print args
         args_table = Table(box=box.SIMPLE, show_header=False, padding=(0, 1))
         args_table.add_column("Key", style="dim")
         args_table.add_column("Value")
-        
+
         for key, value in tool_args.items():
-            # Truncate long values
-            value_str = str(value)
-            if len(value_str) > 100:
-                value_str = value_str[:100] + "..."
-            args_table.add_row(key, value_str)
-        
-        console.print(args_table)
+            args_table.add_row(key, _truncate(str(value), 100))
+
+        parts.append(args_table)
+
+    # Single buffered print for the blank line, header and args table
+    console.print(Group(*parts))
 
 
 def display_tool_result(tool_name: str, result: str, success: bool = True):
     """Display tool execution result."""
     status = "[green]✓[/green]" if success else "[red]✗[/red]"
-    console.print(f"{status} [dim]Tool {tool_name} completed[/dim]")
-    
+    parts = [Text.from_markup(f"{status} [dim]Tool {tool_name} completed[/dim]")]
+
     # Show truncated result
     if result:
-        result_preview = result[:500] + "..." if len(result) > 500 else result
-        console.print(Panel(
-            result_preview,
+        parts.append(Panel(
+            _truncate(result, 500),
             title=f"[dim]{tool_name} result[/dim]",
             border_style="dim",
             expand=False,
         ))
 
+    # Single buffered print for the status line and result panel
+    console.print(Group(*parts))
+
+
+# Characters whose presence suggests Markdown structure; answers without
+# any of them render as plain Text, skipping the full Markdown parse
+_MARKDOWN_HINT_CHARS = ("#", "*", "`", "[", "|", "_", ">")
+
 
 def display_agent_response(content: str):
     """Display the final agent response."""
-    console.print()
-    console.print(Panel(
-        Markdown(content),
+    if any(c in content for c in _MARKDOWN_HINT_CHARS):
+        body = Markdown(content)
+    else:
+        body = Text(content)
+    # Leading blank line rides along in the same buffered print
+    console.print(Group(Text(""), Panel(
+        body,
         title="[bold blue]🤖 Assistant[/bold blue]",
         border_style="blue",
         padding=(1, 2),
-    ))
+    )))
 
 
 def display_user_message(message: str):
     """Display user message."""
-    console.print()
-    console.print(Panel(
+    console.print(Group(Text(""), Panel(
         message,
         title="[bold green]👤 You[/bold green]",
         border_style="green",
         padding=(0, 2),
-    ))
+    )))
+
+
+# Tools come from the shared get_all_tools() list, so the rendered table is
+# memoized against that list object and rebuilt only if a different list is
+# ever passed (same single-slot pattern as the agent's run-config cache)
+_TOOLS_RENDERABLE: tuple = (None, None)
 
 
 def display_tools_list(tools: list):
     """Display available tools."""
-    console.print()
-    console.print(Panel("[bold]🛠️ Available Tools[/bold]", border_style="yellow"))
-    
-    table = Table(box=box.ROUNDED, show_header=True, header_style="bold yellow")
-    table.add_column("Tool Name", style="cyan")
-    table.add_column("Description")
-    
-    for tool in tools:
-        name = getattr(tool, "name", str(tool))
-        desc = getattr(tool, "description", "No description")
-        # Truncate description
-        if len(desc) > 80:
-            desc = desc[:80] + "..."
-        table.add_row(name, desc)
-    
-    console.print(table)
+    global _TOOLS_RENDERABLE
 
+    cached_tools, renderable = _TOOLS_RENDERABLE
+    if cached_tools is not tools:
+        table = Table(box=box.ROUNDED, show_header=True, header_style="bold yellow")
+        table.add_column("Tool Name", style="cyan")
+        table.add_column("Description")
 
-def display_config():
-    """Display current configuration."""
+        for tool in tools:
+            name = getattr(tool, "name", str(tool))
+            desc = getattr(tool, "description", "No description")
+            table.add_row(name, _truncate(desc, 80))
+
+        renderable = Group(
+            Text(""),
+            Panel("[bold]🛠️ Available Tools[/bold]", border_style="yellow"),
+            table,
+        )
+        _TOOLS_RENDERABLE = (tools, renderable)
+
+    console.print(renderable)
+
+
+@lru_cache(maxsize=1)
+def _config_renderable() -> Group:
+    """Build the /config display once; settings are fixed per process."""
     from src.models.config import get_settings
-    
+
     settings = get_settings()
-    
-    console.print()
-    console.print(Panel("[bold]⚙️ Configuration[/bold]", border_style="magenta"))
-    
+
     table = Table(box=box.ROUNDED, show_header=False)
     table.add_column("Setting", style="cyan")
     table.add_column("Value")
-    
+
     # Vision model
     table.add_row("Vision API Key", "✓ Set" if settings.is_doubao_configured else "✗ Not set")
     table.add_row("Vision Model", settings.doubao_model)
     table.add_row("Vision Base URL", settings.doubao_base_url or "default")
-    
+
     # Agent
     table.add_row("Agent API Key", "✓ Set" if settings.is_agent_configured else "✗ Not set")
     table.add_row("Agent Model", settings.agent_model)
     table.add_row("Agent Base URL", settings.agent_base_url or "default")
     table.add_row("Agent Temperature", str(settings.agent_temperature))
-    
+
     # Output
     table.add_row("Output Directory", str(settings.default_output_dir))
     table.add_row("Auto Save", str(settings.auto_save))
-    
-    console.print(table)
+
+    return Group(
+        Text(""),
+        Panel("[bold]⚙️ Configuration[/bold]", border_style="magenta"),
+        table,
+    )
+
+
+def display_config():
+    """Display current configuration."""
+    console.print(_config_renderable())
 
 
 def display_thinking():
@@ -366,76 +466,121 @@ def stream_chat(agent, message: str, thread_id: str, verbose: bool = True, token
         verbose: Whether to show detailed tool info
         token_tracker: Optional TokenTracker to track usage
     """
+    # Deferred: rich.live is only needed on this streaming path
+    from rich.live import Live
+
     display_user_message(message)
-    
+
     final_response = ""
+
+    # Display dedup: middleware before_model nodes stream their rewrites
+    # (masked/trimmed tool results) as fresh updates carrying already-shown
+    # tool_call_ids, so each call/result renders only once
     seen_tool_calls = set()
     seen_tool_results = set()
-    
+
     # Track messages seen in this stream to calculate usage
     stream_messages = []
-    
+
+    # Live token rendering state: buffer of streamed text plus the active
+    # Live region (created on the first token, closed before tool output)
+    token_buffer = ""
+    live = None
+
+    def _close_live():
+        nonlocal live, token_buffer
+        if live is not None:
+            live.stop()
+            live = None
+        token_buffer = ""
+
     try:
-        console.print()
-        console.print("[dim]Processing...[/dim]")
-        
-        for chunk in agent.stream(message, thread_id):
-            # Process different chunk types based on LangGraph stream output
-            # chunk is typically a dict with node names as keys
-            
-            for node_name, node_output in chunk.items():
-                # Get messages from this node's output
+        console.print("\n[dim]Processing...[/dim]")
+
+        for mode, payload in agent.stream(
+            message, thread_id, stream_mode=["updates", "messages"]
+        ):
+            # "messages" events carry (chunk, metadata) pairs of raw LLM
+            # tokens — render them as they arrive so long answers appear
+            # incrementally instead of after the full generation
+            if mode == "messages":
+                msg_chunk, _metadata = payload
+                text = getattr(msg_chunk, "content", "")
+                if isinstance(text, str) and text:
+                    token_buffer += text
+                    if live is None:
+                        live = Live(
+                            Markdown(token_buffer),
+                            console=console,
+                            refresh_per_second=10,
+                        )
+                        live.start()
+                    else:
+                        live.update(Markdown(token_buffer))
+                continue
+
+            # "updates" events keep driving the tool visualization
+            for node_name, node_output in payload.items():
                 messages = node_output.get("messages", [])
                 stream_messages.extend(messages)
-                
+
                 for msg in messages:
-                    msg_id = id(msg)
                     role = _get_message_role(msg)
-                    
+                    # One attribute probe per message; () when absent/empty
+                    tool_calls = getattr(msg, "tool_calls", None) or ()
+
                     # Handle AI messages with tool calls
-                    if hasattr(msg, "tool_calls") and msg.tool_calls:
-                        for tool_call in msg.tool_calls:
+                    if tool_calls:
+                        # Any streamed text so far was interim reasoning for
+                        # this tool turn; finalize it before tool output
+                        _close_live()
+                        for tool_call in tool_calls:
                             tc_id = tool_call.get("id") if isinstance(tool_call, dict) else getattr(tool_call, "id", None)
-                            
+
                             # Only display each tool call once
                             if tc_id and tc_id not in seen_tool_calls:
                                 seen_tool_calls.add(tc_id)
                                 tc_name = tool_call.get("name") if isinstance(tool_call, dict) else getattr(tool_call, "name", "unknown")
                                 tc_args = tool_call.get("args", {}) if isinstance(tool_call, dict) else getattr(tool_call, "args", {})
-                                
+
                                 if verbose:
                                     display_tool_call(tc_name, tc_args)
                                 else:
                                     console.print(f"[yellow]🔧 {tc_name}[/yellow]")
-                    
+
                     # Handle tool result messages
                     if role == "tool" and hasattr(msg, "tool_call_id"):
                         tc_id = msg.tool_call_id
-                        
+
                         # Only display each tool result once
                         if tc_id and tc_id not in seen_tool_results:
                             seen_tool_results.add(tc_id)
                             tool_name = getattr(msg, "name", "tool")
-                            content = _get_message_content(msg)
-                            
+                            # +1 over display_tool_result's 500-char preview cap
+                            content = _get_message_content(msg, max_len=501)
+
                             if verbose:
                                 display_tool_result(tool_name, content)
                             else:
                                 console.print(f"[green]✓[/green] [dim]{tool_name} done[/dim]")
                     
                     # Capture final AI response (no tool calls = final answer)
-                    if role in ("ai", "assistant") and hasattr(msg, "content") and msg.content:
-                        if not (hasattr(msg, "tool_calls") and msg.tool_calls):
-                            final_response = _get_message_content(msg)
-        
+                    if role in ("ai", "assistant") and not tool_calls and getattr(msg, "content", None):
+                        final_response = _get_message_content(msg)
+
+        # Leave the final streamed answer on screen
+        if live is not None:
+            live.stop()
+            live = None
+
         if token_tracker:
                 call_usage = token_tracker.process_messages(stream_messages)
                 display_token_usage(call_usage, token_tracker.total_tokens)
-            
-        
+
+
     except Exception as e:
+        _close_live()
         console.print(f"[red]Error during streaming: {e}[/red]")
-        import traceback
         if os.environ.get("DEBUG"):
             console.print(f"[dim]{traceback.format_exc()}[/dim]")
         # Fall back to non-streaming
@@ -469,14 +614,17 @@ def invoke_chat(agent, message: str, thread_id: str, verbose: bool = True, token
         
         for msg in messages:
             role = _get_message_role(msg)
-            
+
             # Skip the user message (we already displayed it)
             if role in ("user", "human"):
                 continue
-            
+
+            # One attribute probe per message; () when absent/empty
+            tool_calls = getattr(msg, "tool_calls", None) or ()
+
             # Display tool calls
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tool_call in msg.tool_calls:
+            if tool_calls:
+                for tool_call in tool_calls:
                     tc_id = tool_call.get("id") if isinstance(tool_call, dict) else getattr(tool_call, "id", None)
                     tc_name = tool_call.get("name") if isinstance(tool_call, dict) else getattr(tool_call, "name", "unknown")
                     tc_args = tool_call.get("args", {}) if isinstance(tool_call, dict) else getattr(tool_call, "args", {})
@@ -492,7 +640,8 @@ def invoke_chat(agent, message: str, thread_id: str, verbose: bool = True, token
                 if tool_call_id and tool_call_id not in processed_tools:
                     processed_tools.add(tool_call_id)
                     tool_name = getattr(msg, "name", "tool")
-                    content = _get_message_content(msg)
+                    # +1 over display_tool_result's 500-char preview cap
+                    content = _get_message_content(msg, max_len=501)
                     
                     if verbose:
                         display_tool_result(tool_name, content)
@@ -500,7 +649,7 @@ def invoke_chat(agent, message: str, thread_id: str, verbose: bool = True, token
                         console.print(f"[green]✓[/green] [dim]{tool_name} done[/dim]")
             
             # Capture final AI response (no tool calls = final answer)
-            if role in ("ai", "assistant") and not (hasattr(msg, "tool_calls") and msg.tool_calls):
+            if role in ("ai", "assistant") and not tool_calls:
                 content = _get_message_content(msg)
                 if content:
                     final_response = content
@@ -516,7 +665,6 @@ def invoke_chat(agent, message: str, thread_id: str, verbose: bool = True, token
         
     except Exception as e:
         console.print(f"[red]Error during chat: {e}[/red]")
-        import traceback
         if os.environ.get("DEBUG"):
             console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
@@ -648,31 +796,66 @@ def extract(images, question_type, json_output, word_output, append, verbose):
     is_flag=True,
     help="Process subdirectories recursively"
 )
+@click.option(
+    "--use-batch-api",
+    is_flag=True,
+    help="Submit images via the provider's Batch API (slower, cheaper, no agent)"
+)
 @click.option(
     "-v", "--verbose",
     is_flag=True,
     help="Show detailed agent output including tool calls"
 )
-def batch(directory, question_type, json_output, word_output, recursive, verbose):
+def batch(directory, question_type, json_output, word_output, recursive, use_batch_api, verbose):
     """
     Batch process all images in a directory.
-    
+
     DIRECTORY: Directory containing image files to process.
-    
+
     Examples:
-    
+
         question-agent batch ./images/
-        
+
         question-agent batch ./images/ -r -j all_questions.json
-        
+
+        question-agent batch ./images/ --use-batch-api  # Bulk, lower cost
+
         question-agent batch ./images/ -v  # Show tool calls
     """
     from src.agent import create_question_extraction_agent
-    
+
     console.print(Panel(
         f"[bold]Batch processing: {directory}[/bold]",
         border_style="blue"
     ))
+
+    if use_batch_api:
+        from pathlib import Path
+
+        from src.tools.batch_api import run_batch_extraction
+        from src.tools.batch_processor import find_images_in_directory
+
+        images = find_images_in_directory(Path(directory), recursive)
+        if not images:
+            console.print(f"[yellow]No images found in {directory}.[/yellow]")
+            return
+
+        output_path = Path(json_output) if json_output else Path(directory) / "questions.json"
+        batch_type = "mixed" if question_type == "auto" else question_type
+
+        console.print(f"[dim]Submitting {len(images)} image(s) via Batch API...[/dim]")
+
+        try:
+            success, message = run_batch_extraction(images, output_path, batch_type)
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise click.Abort()
+
+        if success:
+            console.print(f"[green]✓ {message}[/green]")
+        else:
+            console.print(f"[red]✗ {message}[/red]")
+        return
     
     # Build the request message
     type_hint = f"（类型：{question_type}）" if question_type != "auto" else ""
@@ -739,13 +922,23 @@ def interactive(language, no_stream, verbose):
         
         question-agent interactive --quiet  # Hide tool details
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     from src.agent import create_question_extraction_agent
-    
+
+    # Start building the agent while the welcome screen renders: factory
+    # setup (model clients, compiled graph) overlaps with terminal output
+    # instead of running after it
+    executor = ThreadPoolExecutor(max_workers=1)
+    agent_future = executor.submit(
+        create_question_extraction_agent, language=language
+    )
+
     console.clear()
     display_welcome()
-    
+
     try:
-        agent = create_question_extraction_agent(language=language)
+        agent = agent_future.result()
         thread_id = agent.thread_id
         token_tracker = TokenTracker()
         
@@ -756,67 +949,98 @@ def interactive(language, no_stream, verbose):
         console.print(f"[red]Failed to initialize agent: {e}[/red]")
         console.print("[yellow]Please check your API keys in .env file.[/yellow]")
         return
-    
+    finally:
+        executor.shutdown(wait=False)
+
+    # Slash-command handlers; each takes the argument tokens and returns
+    # True to leave the chat loop. A dict lookup replaces the previous
+    # linear elif scan and keeps alias commands (/exit, /quit, /q) cheap.
+    def _cmd_exit(args):
+        console.print("\n[blue]Goodbye! 👋[/blue]")
+        return True
+
+    def _cmd_help(args):
+        display_welcome()
+
+    # Chat turns sent on the current thread: the checkpointer is in-process,
+    # so a thread with zero turns has no history and /memory can answer
+    # without a checkpoint fetch
+    chat_turns = 0
+
+    def _cmd_memory(args):
+        if chat_turns == 0:
+            console.print("[yellow]No conversation history yet.[/yellow]")
+            return
+        # Optional tail size: /memory 100
+        try:
+            limit = int(args[0]) if args else MEMORY_DISPLAY_LIMIT
+        except ValueError:
+            limit = MEMORY_DISPLAY_LIMIT
+        display_memory(agent, thread_id, limit)
+
+    def _cmd_clear(args):
+        nonlocal thread_id, chat_turns
+        thread_id = agent.new_conversation()
+        chat_turns = 0
+        console.print(f"[green]✓ Started new conversation. Thread ID: {thread_id[:8]}...[/green]")
+
+    def _cmd_config(args):
+        display_config()
+
+    def _cmd_tools(args):
+        display_tools_list(agent.tools)
+
+    def _cmd_verbose(args):
+        nonlocal verbose
+        verbose = not verbose
+        console.print(f"[green]✓ Verbose mode: {'ON' if verbose else 'OFF'}[/green]")
+
+    def _cmd_debug(args):
+        # Toggle debug mode
+        if os.environ.get("DEBUG"):
+            del os.environ["DEBUG"]
+            console.print("[green]✓ Debug mode: OFF[/green]")
+        else:
+            os.environ["DEBUG"] = "1"
+            console.print("[green]✓ Debug mode: ON[/green]")
+
+    commands = {
+        "/exit": _cmd_exit,
+        "/quit": _cmd_exit,
+        "/q": _cmd_exit,
+        "/help": _cmd_help,
+        "/memory": _cmd_memory,
+        "/clear": _cmd_clear,
+        "/config": _cmd_config,
+        "/tools": _cmd_tools,
+        "/verbose": _cmd_verbose,
+        "/debug": _cmd_debug,
+    }
+
     # Main chat loop
     while True:
         try:
-            # Get user input
-            console.print()
+            # Get user input (plain newline; no markup to render)
+            print()
             user_input = console.input("[bold green]You>[/bold green] ").strip()
-            
+
             if not user_input:
                 continue
-            
+
             # Handle special commands
             if user_input.startswith("/"):
                 cmd_parts = user_input.lower().split()
-                cmd = cmd_parts[0]
-                
-                if cmd in ("/exit", "/quit", "/q"):
-                    console.print("\n[blue]Goodbye! 👋[/blue]")
-                    break
-                
-                elif cmd == "/help":
-                    display_welcome()
-                    continue
-                
-                elif cmd == "/memory":
-                    display_memory(agent, thread_id)
-                    continue
-                
-                elif cmd == "/clear":
-                    thread_id = agent.new_conversation()
-                    console.print(f"[green]✓ Started new conversation. Thread ID: {thread_id[:8]}...[/green]")
-                    continue
-                
-                elif cmd == "/config":
-                    display_config()
-                    continue
-                
-                elif cmd == "/tools":
-                    display_tools_list(agent.tools)
-                    continue
-                
-                elif cmd == "/verbose":
-                    verbose = not verbose
-                    console.print(f"[green]✓ Verbose mode: {'ON' if verbose else 'OFF'}[/green]")
-                    continue
-                
-                elif cmd == "/debug":
-                    # Toggle debug mode
-                    if os.environ.get("DEBUG"):
-                        del os.environ["DEBUG"]
-                        console.print("[green]✓ Debug mode: OFF[/green]")
-                    else:
-                        os.environ["DEBUG"] = "1"
-                        console.print("[green]✓ Debug mode: ON[/green]")
-                    continue
-                
-                else:
-                    console.print(f"[yellow]Unknown command: {cmd}. Type /help for available commands.[/yellow]")
+                handler = commands.get(cmd_parts[0])
+
+                if handler is None:
+                    console.print(f"[yellow]Unknown command: {cmd_parts[0]}. Type /help for available commands.[/yellow]")
                     continue
+                if handler(cmd_parts[1:]):
+                    break
+                continue
             
             # Regular chat message
+            chat_turns += 1
             if no_stream:
                 invoke_chat(agent, user_input, thread_id, verbose, token_tracker)
             else:
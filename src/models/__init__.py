@@ -14,7 +14,7 @@ from .questions import (
     ValidationIssue,
     AgentResponse,
 )
-from .config import Settings, get_settings
+from .config import Settings, get_settings, reset_settings
 
 __all__ = [
     # Question models
@@ -31,4 +31,5 @@ __all__ = [
     # Config
     "Settings",
     "get_settings",
+    "reset_settings",
 ]
@@ -5,12 +5,56 @@ This module provides centralized configuration for the question extraction agent
 loading values from environment variables and .env files.
 """
 
-from functools import lru_cache
+import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings.sources import DotEnvSettingsSource
+
+
+@lru_cache(maxsize=4)
+def _read_env_file_cached(
+    file_path: str,
+    mtime: float,
+    encoding: Optional[str],
+    case_sensitive: bool,
+    ignore_empty: bool,
+    parse_none_str: Optional[str],
+):
+    """Parse a dotenv file once per (path, mtime); mtime busts stale entries."""
+    return DotEnvSettingsSource._static_read_env_file(
+        Path(file_path),
+        encoding=encoding,
+        case_sensitive=case_sensitive,
+        ignore_empty=ignore_empty,
+        parse_none_str=parse_none_str,
+    )
+
+
+class _CachedDotEnvSource(DotEnvSettingsSource):
+    """Dotenv source that memoizes file parsing across Settings constructions.
+
+    Repeated Settings() construction (tests, subprocess workers) re-reads and
+    re-tokenizes .env each time; keying the parsed dict on the file's mtime
+    amortizes that to one parse until the file changes.
+    """
+
+    def _read_env_file(self, file_path: Path):
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return {}
+        return _read_env_file_cached(
+            str(file_path),
+            mtime,
+            self.env_file_encoding,
+            self.case_sensitive,
+            self.env_ignore_empty,
+            self.env_parse_none_str,
+        )
 
 
 class Settings(BaseSettings):
@@ -27,7 +71,24 @@ class Settings(BaseSettings):
         case_sensitive=False,
         extra="ignore",
     )
-    
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls,
+        init_settings,
+        env_settings,
+        dotenv_settings,
+        file_secret_settings,
+    ):
+        """Swap the dotenv source for the mtime-cached variant."""
+        return (
+            init_settings,
+            env_settings,
+            _CachedDotEnvSource(settings_cls),
+            file_secret_settings,
+        )
+
     # -------------------------------------------------------------------------
     # Vision Model Configuration (Doubao)
     # -------------------------------------------------------------------------
@@ -94,6 +155,11 @@ class Settings(BaseSettings):
         description="API key for Anthropic"
     )
 
+    checkpoint_lru_size: int = Field(
+        default=128,
+        description="Threads retained by the LRU checkpointer before eviction"
+    )
+
     # -------------------------------------------------------------------------
     # Output Configuration
     # -------------------------------------------------------------------------
@@ -121,6 +187,18 @@ class Settings(BaseSettings):
         default=2,
         description="JSON indentation spaces"
     )
+
+    # -------------------------------------------------------------------------
+    # Recognition Cache
+    # -------------------------------------------------------------------------
+    enable_recognition_cache: bool = Field(
+        default=True,
+        description="Cache vision model results on disk to skip repeat LLM calls"
+    )
+    recognition_cache_dir: Path = Field(
+        default=Path("~/.cache/image2questions"),
+        description="Directory for cached recognition results"
+    )
     
     # -------------------------------------------------------------------------
     # Logging
@@ -133,41 +211,55 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------------------
     # Computed Properties
     # -------------------------------------------------------------------------
-    @property
+    # cached_property: the underlying keys never change after construction,
+    # so each value is derived once and later accesses are plain dict hits
+    @cached_property
     def is_doubao_configured(self) -> bool:
         """Check if Doubao API is properly configured."""
         return bool(self.doubao_api_key)
-    
-    @property
+
+    @cached_property
     def is_agent_configured(self) -> bool:
         """Check if agent LLM is properly configured."""
         return bool(self.agent_api_key or self.doubao_api_key)
-    
-    @property
+
+    @cached_property
     def effective_agent_api_key(self) -> str:
         """Get the effective API key for the agent (falls back to Doubao key)."""
         return self.agent_api_key or self.doubao_api_key or ""
     
+    @cached_property
+    def _output_dir_str(self) -> str:
+        """Output directory as a string, for C-level os.path.join."""
+        return str(self.default_output_dir)
+
+    @cached_property
+    def _default_filenames(self) -> dict:
+        """Default filename per file type, built once per instance."""
+        return {
+            "json": self.default_json_filename,
+            "word": self.default_word_filename,
+        }
+
     def get_output_path(self, filename: Optional[str] = None, file_type: str = "json") -> Path:
         """
         Get the full output path for a file.
-        
+
         Args:
             filename: Optional custom filename
             file_type: Type of file ('json' or 'word')
-            
+
         Returns:
             Full path to the output file
         """
-        if filename:
-            return self.default_output_dir / filename
-        
-        if file_type == "json":
-            return self.default_output_dir / self.default_json_filename
-        elif file_type == "word":
-            return self.default_output_dir / self.default_word_filename
-        else:
-            raise ValueError(f"Unknown file type: {file_type}")
+        if not filename:
+            try:
+                filename = self._default_filenames[file_type]
+            except KeyError:
+                raise ValueError(f"Unknown file type: {file_type}") from None
+        # os.path.join is C-accelerated; one Path is built at the end
+        # instead of going through PurePath division
+        return Path(os.path.join(self._output_dir_str, filename))
     
     def ensure_output_dir(self) -> Path:
         """Ensure the output directory exists and return its path."""
@@ -175,12 +267,28 @@ class Settings(BaseSettings):
         return self.default_output_dir
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get the application settings (cached singleton).
-    
+
     Returns:
         Settings instance loaded from environment
     """
     return Settings()
+
+
+def reset_settings() -> Settings:
+    """
+    Drop the cached Settings and rebuild it from the current environment.
+
+    Callers must fetch the instance through get_settings(); there is
+    deliberately no module-level ``settings`` binding, because any copy
+    imported with ``from ... import settings`` would keep pointing at the
+    pre-reset object.
+
+    Returns:
+        The freshly constructed Settings instance
+    """
+    get_settings.cache_clear()
+    return get_settings()
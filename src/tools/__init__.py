@@ -16,16 +16,17 @@ Tools:
 Example:
     from langchain.agents import create_agent
     from src.tools import get_all_tools
-    
+
     tools = get_all_tools()
     agent = create_agent(model="gpt-4o", tools=tools)
 """
 
-from .image_analysis import analyze_image
-from .validation import validate_questions_tool
-from .batch_processor import batch_process_images
+import importlib
+import types
 
-# Also export result models for programmatic use
+# Result models are lightweight (pydantic only) and stay eagerly imported;
+# the tool modules below pull in the OpenAI SDK and LangChain, so they are
+# deferred until a tool is actually requested (PEP 562)
 from .base import (
     ToolResult,
     ImageAnalysisResult,
@@ -35,16 +36,49 @@ from .base import (
 )
 
 
+# Lazily imported tool attributes: name -> (submodule, attribute)
+_LAZY_TOOLS = {
+    "analyze_image": ("image_analysis", "analyze_image"),
+    "validate_questions_tool": ("validation", "validate_questions_tool"),
+    "batch_process_images": ("batch_processor", "batch_process_images"),
+}
+
+
+def _load_tool(name: str):
+    """Import and cache a tool attribute on first access."""
+    module_name, attr = _LAZY_TOOLS[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    # Subsequent attribute lookups hit module globals, skipping __getattr__
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name: str):
+    if name in _LAZY_TOOLS:
+        return _load_tool(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Tool collections are fixed but built on first request, not at import;
+# every get_all_tools() caller still shares the same list so the
+# compiled-agent cache can key on a stable object
+_ALL_TOOLS: list = []
+
+_TOOL_MAP = None
+
+
 def get_all_tools() -> list:
     """Get all available tools for the agent.
-    
+
     Returns:
         List of LangChain tool functions ready to use with an agent.
-    
+        The same list object is returned on every call; treat it as
+        read-only.
+
     Example:
         from langchain.agents import create_agent
         from src.tools import get_all_tools
-        
+
         tools = get_all_tools()
         agent = create_agent(
             model="gpt-4o",
@@ -52,28 +86,41 @@ def get_all_tools() -> list:
             system_prompt="You are a helpful assistant..."
         )
     """
-    return [
-        analyze_image,
-        validate_questions_tool,
-        batch_process_images,
-    ]
+    if not _ALL_TOOLS:
+        _ALL_TOOLS.extend(_load_tool(name) for name in _LAZY_TOOLS)
+    return _ALL_TOOLS
+
+
+def get_tool_map() -> dict:
+    """Get all tools indexed by name for O(1) lookup.
+
+    Returns:
+        Read-only mapping of tool name to the LangChain tool; the same
+        object is returned on every call.
+    """
+    global _TOOL_MAP
+    if _TOOL_MAP is None:
+        # MappingProxyType makes the shared registry genuinely read-only
+        # instead of read-only by convention; lookups stay plain dict hits
+        _TOOL_MAP = types.MappingProxyType({tool.name: tool for tool in get_all_tools()})
+    return _TOOL_MAP
 
 
 def get_extraction_tools() -> list:
     """Get only image extraction tools.
-    
+
     Returns:
         List of tools for extracting questions from images.
     """
     return [
-        analyze_image,
-        batch_process_images,
+        _load_tool("analyze_image"),
+        _load_tool("batch_process_images"),
     ]
 
 
 def get_output_tools() -> list:
     """Get only file output tools.
-    
+
     Returns:
         List of tools for loading questions from files.
     """
@@ -83,12 +130,12 @@ def get_output_tools() -> list:
 
 def get_validation_tools() -> list:
     """Get only validation tools.
-    
+
     Returns:
         List of tools for validating questions.
     """
     return [
-        validate_questions_tool,
+        _load_tool("validate_questions_tool"),
     ]
 
 
@@ -99,6 +146,7 @@ __all__ = [
     "batch_process_images",
     # Tool getters
     "get_all_tools",
+    "get_tool_map",
     "get_extraction_tools",
     "get_output_tools",
     "get_validation_tools",
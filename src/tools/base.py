@@ -4,27 +4,36 @@ Base module for LangChain tools.
 This module provides shared utilities and base classes for all tools.
 """
 
+from functools import cached_property
 from typing import Any
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ToolResult(BaseModel):
     """Standard result format for tool operations."""
+    # frozen so the rendered observation below can be cached per instance;
+    # extra="forbid" lets pydantic-core keep the compact instance layout
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     success: bool = Field(description="Whether the operation was successful")
     message: str = Field(description="Human-readable message about the result")
     data: dict[str, Any] = Field(default_factory=dict, description="Additional result data")
-    
+
+    @cached_property
+    def _as_str(self) -> str:
+        """Render the observation text once per instance."""
+        prefix = "✓" if self.success else "✗"
+        if not self.data:
+            return f"{prefix} {self.message}"
+        # orjson serializes the payload in Rust, far cheaper than dict repr
+        # for large data; default=str keeps non-JSON values printable
+        return f"{prefix} {self.message}\nData: {orjson.dumps(self.data, default=str).decode()}"
+
     def __str__(self) -> str:
         """Return a string representation for the agent."""
-        if self.success:
-            result = f"✓ {self.message}"
-        else:
-            result = f"✗ {self.message}"
-        
-        if self.data:
-            result += f"\nData: {self.data}"
-        return result
+        return self._as_str
 
 
 class BatchProcessArgs(BaseModel):
@@ -37,6 +46,10 @@ class BatchProcessArgs(BaseModel):
 
 class ImageAnalysisResult(BaseModel):
     """Result from image analysis tool."""
+    # Result objects are write-once: freezing drops the __setattr__ check
+    # chain and forbidding extras keeps instances compact in batch runs
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     success: bool = Field(description="Whether analysis was successful")
     question_count: int = Field(default=0, description="Number of questions extracted")
     question_type: str = Field(default="", description="Type of questions (multiple_choice or true_false)")
@@ -47,6 +60,9 @@ class ImageAnalysisResult(BaseModel):
 
 class FileOperationResult(BaseModel):
     """Result from file generation tools."""
+    # Same write-once rationale as ImageAnalysisResult
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     success: bool = Field(description="Whether file operation was successful")
     file_path: str = Field(default="", description="Path to the generated file")
     items_processed: int = Field(default=0, description="Number of items processed")
@@ -56,6 +72,9 @@ class FileOperationResult(BaseModel):
 
 class ValidationResult(BaseModel):
     """Result from validation tool."""
+    # Same write-once rationale as ImageAnalysisResult
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     success: bool = Field(description="Whether validation passed")
     is_valid: bool = Field(description="Whether all questions are valid")
     total_questions: int = Field(default=0, description="Total questions validated")
@@ -67,6 +86,9 @@ class ValidationResult(BaseModel):
 
 class BatchProcessingResult(BaseModel):
     """Result from batch processing tool."""
+    # Same write-once rationale as ImageAnalysisResult
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     status: str = Field(description="Status of the batch processing (e.g., 'completed', 'in_progress', 'failed')")
     total_images: int = Field(default=0, description="Total images discovered")
     total_questions: int = Field(default=0, description="Total questions extracted and saved")
@@ -78,3 +100,17 @@ class BatchProcessingResult(BaseModel):
     result_files: list[str] = Field(default_factory=list, description="JSON files created by the batch run")
     errors: list[str] = Field(default_factory=list, description="Error messages from failed images")
     error: str | None = Field(default=None, description="Overall error message if failed")
+
+
+# Resolve any deferred pydantic schema builds at import so the first tool
+# call does not pay them (same warmup as src/models/questions.py)
+for _model in (
+    ToolResult,
+    BatchProcessArgs,
+    ImageAnalysisResult,
+    FileOperationResult,
+    ValidationResult,
+    BatchProcessingResult,
+):
+    _model.model_rebuild()
+del _model
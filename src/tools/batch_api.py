@@ -0,0 +1,220 @@
+"""
+OpenAI-compatible Batch API support for bulk extraction.
+
+For large question banks the interactive flow pays per-request overhead and
+full-price tokens for every image. The Batch API trades wall time for cost:
+requests are written to a JSONL file, submitted as one batch, processed
+asynchronously by the provider, and collected when done.
+
+This module is not a LangChain tool; it is invoked directly from the CLI via
+`question-agent batch --use-batch-api`.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from openai import OpenAI
+
+from src.utils.image_utils import build_image_content
+
+from ..models.config import get_settings
+from .image_analysis import (
+    MIXED_PROMPT,
+    MULTIPLE_CHOICE_PROMPT,
+    TRUE_FALSE_PROMPT,
+    MixedResponse,
+    MultipleChoiceResponse,
+    TrueFalseResponse,
+    _chunk_image_paths,
+    _mc_question_dict,
+    _tf_question_dict,
+    save_questions_to_json,
+)
+
+# Terminal batch states as defined by the Batch API
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Seconds between status polls
+DEFAULT_POLL_INTERVAL = 30.0
+
+_PROMPTS = {
+    "multiple_choice": MULTIPLE_CHOICE_PROMPT,
+    "true_false": TRUE_FALSE_PROMPT,
+    "mixed": MIXED_PROMPT,
+}
+
+_INTRO_TEXTS = {
+    "multiple_choice": "请识别以下图片中的所有选择题。",
+    "true_false": "请识别以下图片中的所有判断题。",
+    "mixed": "请识别以下图片中的所有题目，包括选择题和判断题。",
+}
+
+_RESPONSE_MODELS = {
+    "multiple_choice": MultipleChoiceResponse,
+    "true_false": TrueFalseResponse,
+    "mixed": MixedResponse,
+}
+
+
+def build_batch_request_lines(
+    image_paths: list[str],
+    question_type: str,
+    model: str,
+) -> tuple[list[str], dict[str, list[str]]]:
+    """Build one Batch API request line per chunk of images.
+
+    Args:
+        image_paths: Paths to the images to process
+        question_type: "multiple_choice", "true_false", or "mixed"
+        model: Vision model name
+
+    Returns:
+        Tuple of (JSONL request lines, mapping of custom_id -> image chunk)
+    """
+    response_model = _RESPONSE_MODELS[question_type]
+
+    lines = []
+    chunk_map: dict[str, list[str]] = {}
+
+    for i, chunk in enumerate(_chunk_image_paths(image_paths)):
+        custom_id = f"chunk-{i}"
+        chunk_map[custom_id] = chunk
+
+        content = [{"type": "text", "text": _INTRO_TEXTS[question_type]}]
+        content.extend(build_image_content(chunk))
+
+        request = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": _PROMPTS[question_type]},
+                    {"role": "user", "content": content},
+                ],
+                "response_format": {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": response_model.__name__,
+                        "schema": response_model.model_json_schema(),
+                    },
+                },
+            },
+        }
+        lines.append(json.dumps(request, ensure_ascii=False))
+
+    return lines, chunk_map
+
+
+def parse_batch_output_line(
+    line: str,
+    question_type: str,
+    chunk_map: dict[str, list[str]],
+) -> dict:
+    """Parse one Batch API output line into question lists.
+
+    Args:
+        line: JSON line from the batch output file
+        question_type: Question type the batch was submitted with
+        chunk_map: Mapping of custom_id -> source image chunk
+
+    Returns:
+        Dict with "multiple_choice" and "true_false" question lists
+    """
+    data = json.loads(line)
+    custom_id = data.get("custom_id", "")
+    chunk = chunk_map.get(custom_id, [])
+
+    response = data.get("response") or {}
+    if data.get("error") or response.get("status_code") != 200:
+        return {"multiple_choice": [], "true_false": []}
+
+    content = response["body"]["choices"][0]["message"]["content"]
+    parsed = _RESPONSE_MODELS[question_type].model_validate_json(content)
+
+    if question_type == "multiple_choice":
+        mc_items, tf_items = parsed.questions, []
+    elif question_type == "true_false":
+        mc_items, tf_items = [], parsed.questions
+    else:
+        mc_items, tf_items = parsed.multiple_choice_questions, parsed.true_false_questions
+
+    return {
+        "multiple_choice": [_mc_question_dict(q, chunk) for q in mc_items],
+        "true_false": [_tf_question_dict(q, chunk) for q in tf_items],
+    }
+
+
+def run_batch_extraction(
+    image_paths: list[str],
+    output_path: Path,
+    question_type: str = "mixed",
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> tuple[bool, str]:
+    """Submit images through the Batch API and save the extracted questions.
+
+    Blocks while polling the batch status; intended for non-interactive bulk
+    runs where cost matters more than latency.
+
+    Args:
+        image_paths: Paths to the images to process
+        output_path: JSON file to save questions to
+        question_type: "multiple_choice", "true_false", or "mixed"
+        poll_interval: Seconds between status polls
+
+    Returns:
+        Tuple of (success, human-readable message)
+    """
+    if question_type not in _RESPONSE_MODELS:
+        return False, f"Invalid question_type '{question_type}'"
+
+    if not image_paths:
+        return False, "No images to process"
+
+    settings = get_settings()
+    client = OpenAI(
+        api_key=settings.doubao_api_key,
+        base_url=settings.doubao_base_url,
+    )
+
+    lines, chunk_map = build_batch_request_lines(
+        image_paths, question_type, settings.doubao_model
+    )
+
+    batch_file = client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+    while batch.status not in TERMINAL_BATCH_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        return False, f"Batch {batch.id} finished with status '{batch.status}'"
+
+    output_text = client.files.content(batch.output_file_id).text
+
+    questions = {"multiple_choice": [], "true_false": [], "type": question_type}
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        parsed = parse_batch_output_line(line, question_type, chunk_map)
+        questions["multiple_choice"].extend(parsed["multiple_choice"])
+        questions["true_false"].extend(parsed["true_false"])
+
+    questions["processed_images"] = list(image_paths)
+
+    success, save_message = save_questions_to_json(questions, output_path)
+    if not success:
+        return False, f"Batch succeeded but saving failed: {save_message}"
+
+    count = len(questions["multiple_choice"]) + len(questions["true_false"])
+    return True, f"Batch {batch.id} extracted {count} question(s). {save_message}"
@@ -20,7 +20,7 @@ from .base import BatchProcessArgs, BatchProcessingResult
 
 # ==================== Supported Extensions ====================
 
-SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+SUPPORTED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"})
 
 
 def find_images_in_directory(
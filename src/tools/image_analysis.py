@@ -6,18 +6,35 @@ Supports both multiple-choice and true/false question types.
 Automatically saves extracted questions to JSON file.
 """
 
-import base64
 import hashlib
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    # pybase64 is a drop-in replacement with SIMD-accelerated encoding,
+    # noticeably faster on multi-megabyte image payloads
+    import pybase64 as base64
+except ImportError:  # pragma: no cover
+    import base64
+
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain.tools import tool
 from langchain_openai import ChatOpenAI
+from openai import APIConnectionError, APITimeoutError, RateLimitError
 from pydantic import BaseModel, Field
 
+from src.utils.file_utils import dumps_json_bytes
+from src.utils.image_utils import make_data_url
 from src.utils.question_json_utils import load_existing_questions
+from src.utils.recognition_cache import (
+    compute_cache_key,
+    load_cached_result,
+    store_cached_result,
+)
 
 from ..models.config import get_settings
 
@@ -100,6 +117,23 @@ MIXED_PROMPT = """你是一个专业的题目识别助手。请仔细分析图
 
 # ==================== Helper Functions ====================
 
+# Leading question numbering like "1.", "2)", "3、", "4．"; compiled once at
+# import so per-title stripping skips the regex cache lookup
+_LEADING_NUMBER_PATTERN = re.compile(r"^\s*\d+\s*[\.)、．]\s*")
+
+
+def strip_leading_number(title: str) -> str:
+    """Strip a leading question number ("1.", "2)", "3、", ...) from a title.
+
+    The prompts ask the model not to include numbering, but it still slips
+    through occasionally; stripping here keeps titles (and the ids hashed
+    from them) consistent across runs.
+    """
+    if not title:
+        return title
+    return _LEADING_NUMBER_PATTERN.sub("", title)
+
+
 def normalize_question_text(value: str) -> str:
     if value is None:
         return ""
@@ -183,12 +217,14 @@ def validate_image_paths(image_paths: list[str]) -> tuple[list[str], list[str]]:
     errors = []
     
     for path in image_paths:
-        if not os.path.exists(path):
+        # Single stat on the happy path; only failures pay a second one
+        # to distinguish "missing" from "not a regular file"
+        if os.path.isfile(path):
+            valid_paths.append(path)
+        elif not os.path.exists(path):
             errors.append(f"Image not found: {path}")
-        elif not os.path.isfile(path):
-            errors.append(f"Not a file: {path}")
         else:
-            valid_paths.append(path)
+            errors.append(f"Not a file: {path}")
     
     return valid_paths, errors
 
@@ -239,14 +275,8 @@ def save_questions_to_json(
             if "type" in existing:
                 questions["type"] = existing["type"]
         
-        # Format JSON
-        if pretty:
-            content = json.dumps(questions, ensure_ascii=False, indent=2)
-        else:
-            content = json.dumps(questions, ensure_ascii=False)
-        
-        # Write file
-        output_path.write_text(content, encoding="utf-8")
+        # Format and write JSON (orjson fast path when available)
+        output_path.write_bytes(dumps_json_bytes(questions, pretty=pretty))
         
         # Count questions for message
         count = len(questions.get("multiple_choice", [])) + len(questions.get("true_false", []))
@@ -257,52 +287,129 @@ def save_questions_to_json(
         return False, f"Error saving file: {str(e)}"
 
 
+# Upper bound on threads used for parallel image encoding
+MAX_ENCODE_WORKERS = 16
+
+# Images per vision model request; small chunks keep each request fast and
+# limit the blast radius of a single failed call
+IMAGE_CHUNK_SIZE = 4
+
+# Cap on concurrent vision model requests to stay under provider rate limits
+MAX_CONCURRENT_REQUESTS = 8
+
+# Transient provider failures worth retrying automatically
+RETRYABLE_EXCEPTIONS = (RateLimitError, APIConnectionError, APITimeoutError)
+
+# Attempts per model call before giving up (first try + retries)
+MAX_RETRY_ATTEMPTS = 5
+
+
+def _with_retry(structured_llm):
+    """Wrap a structured LLM with exponential-backoff retries.
+
+    A transient 429/timeout/connection error used to fail the whole tool
+    call; retrying with jittered exponential backoff rides out rate-limit
+    pressure instead of wasting the already-completed work.
+    """
+    return structured_llm.with_retry(
+        retry_if_exception_type=RETRYABLE_EXCEPTIONS,
+        wait_exponential_jitter=True,
+        stop_after_attempt=MAX_RETRY_ATTEMPTS,
+    )
+
+
+def _mc_question_dict(q: MultipleChoiceItem, chunk: list[str]) -> dict:
+    """Convert a parsed multiple-choice item into its saved question dict.
+
+    model_dump serializes through pydantic-core's Rust path, which is cheaper
+    than copying the nested options field-by-field in Python.
+    """
+    item = q.model_dump()
+    item["title"] = strip_leading_number(item["title"])
+    item["source_image"] = chunk
+    return ensure_question_id(item, "multiple_choice")
+
+
+def _tf_question_dict(q: TrueFalseItem, chunk: list[str]) -> dict:
+    """Convert a parsed true/false item into its saved question dict."""
+    return ensure_question_id(
+        {"title": strip_leading_number(q.title), "source_image": chunk},
+        "true_false",
+    )
+
+
+def _encode_one(image_path: str) -> dict:
+    """Read and encode a single image into an API content entry."""
+    return {
+        "type": "input_image",
+        "image_url": make_data_url(image_path),
+    }
+
+
 def build_image_content(image_paths: list[str]) -> list[dict]:
-    """Build content list with images for the API call."""
-    content = []
-    
-    for image_path in image_paths:
-        base64_image = encode_image_to_base64(image_path)
-        mime_type = get_image_mime_type(image_path)
-        
-        content.append({
-            "type": "input_image",
-            "image_url": f"data:{mime_type};base64,{base64_image}",
-        })
-    
-    return content
+    """Build content list with images for the API call.
 
+    Images are read and base64-encoded in parallel with a thread pool,
+    overlapping disk I/O across files. Order of the input paths is preserved.
+    """
+    if not image_paths:
+        return []
 
-def extract_multiple_choice(llm: ChatOpenAI, image_paths: list[str]) -> dict:
-    """Extract multiple choice questions from images using direct LLM call."""
-    content = [{"type": "text", "text": "请识别以下图片中的所有选择题。"}]
-    content.extend(build_image_content(image_paths))
-    
-    structured_llm = llm.with_structured_output(MultipleChoiceResponse)
-    
-    messages = [
-        SystemMessage(content=MULTIPLE_CHOICE_PROMPT),
-        HumanMessage(content=content)
-    ]
-    
-    result = structured_llm.invoke(messages)
-    
-    multiple_choice_items = [
-        ensure_question_id(
-            {
-                "title": q.title,
-                "options": {
-                    "a": q.options.a,
-                    "b": q.options.b,
-                    "c": q.options.c,
-                    "d": q.options.d,
-                },
-                "source_image": image_paths,
-            },
-            "multiple_choice",
+    with ThreadPoolExecutor(max_workers=min(MAX_ENCODE_WORKERS, len(image_paths))) as executor:
+        return list(executor.map(_encode_one, image_paths))
+
+
+def _chunk_image_paths(image_paths: list[str], chunk_size: int = IMAGE_CHUNK_SIZE) -> list[list[str]]:
+    """Split image paths into chunks of at most chunk_size."""
+    return [image_paths[i:i + chunk_size] for i in range(0, len(image_paths), chunk_size)]
+
+
+def _invoke_chunked(structured_llm, system_prompt: str, intro_text: str, image_paths: list[str]):
+    """Call the vision model once per chunk of images, fanning out in parallel.
+
+    One huge multi-image request makes latency grow linearly with image count
+    and lets a single model error waste the whole job. Instead the images are
+    split into small chunks, sent as independent requests (concurrently via
+    LangChain's batch when there is more than one chunk), and the parsed
+    responses are returned as (chunk, response) pairs in input order.
+    """
+    chunks = _chunk_image_paths(image_paths)
+
+    # Encode every image through one thread pool up front so disk reads
+    # overlap across chunk boundaries too, not just within a chunk
+    encoded = build_image_content(image_paths)
+
+    message_batches = []
+    offset = 0
+    for chunk in chunks:
+        content = [{"type": "text", "text": intro_text}]
+        content.extend(encoded[offset:offset + len(chunk)])
+        offset += len(chunk)
+        message_batches.append([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=content),
+        ])
+
+    if len(message_batches) == 1:
+        responses = [structured_llm.invoke(message_batches[0])]
+    else:
+        responses = structured_llm.batch(
+            message_batches,
+            config={"max_concurrency": MAX_CONCURRENT_REQUESTS},
         )
-        for q in result.questions
-    ]
+
+    return list(zip(chunks, responses))
+
+
+def extract_multiple_choice(llm: ChatOpenAI, image_paths: list[str]) -> dict:
+    """Extract multiple choice questions from images using direct LLM calls."""
+    structured_llm = _with_retry(llm.with_structured_output(MultipleChoiceResponse))
+
+    multiple_choice_items = []
+    for chunk, result in _invoke_chunked(
+        structured_llm, MULTIPLE_CHOICE_PROMPT, "请识别以下图片中的所有选择题。", image_paths
+    ):
+        multiple_choice_items.extend(_mc_question_dict(q, chunk) for q in result.questions)
 
     return {
         "type": "multiple_choice",
@@ -311,23 +418,14 @@ def extract_multiple_choice(llm: ChatOpenAI, image_paths: list[str]) -> dict:
 
 
 def extract_true_false(llm: ChatOpenAI, image_paths: list[str]) -> dict:
-    """Extract true/false questions from images using direct LLM call."""
-    content = [{"type": "text", "text": "请识别以下图片中的所有判断题。"}]
-    content.extend(build_image_content(image_paths))
-    
-    structured_llm = llm.with_structured_output(TrueFalseResponse)
-    
-    messages = [
-        SystemMessage(content=TRUE_FALSE_PROMPT),
-        HumanMessage(content=content)
-    ]
-    
-    result = structured_llm.invoke(messages)
-    
-    true_false_items = [
-        ensure_question_id({"title": q.title, "source_image": image_paths}, "true_false")
-        for q in result.questions
-    ]
+    """Extract true/false questions from images using direct LLM calls."""
+    structured_llm = _with_retry(llm.with_structured_output(TrueFalseResponse))
+
+    true_false_items = []
+    for chunk, result in _invoke_chunked(
+        structured_llm, TRUE_FALSE_PROMPT, "请识别以下图片中的所有判断题。", image_paths
+    ):
+        true_false_items.extend(_tf_question_dict(q, chunk) for q in result.questions)
 
     return {
         "type": "true_false",
@@ -336,41 +434,17 @@ def extract_true_false(llm: ChatOpenAI, image_paths: list[str]) -> dict:
 
 
 def extract_mixed(llm: ChatOpenAI, image_paths: list[str]) -> dict:
-    """Extract both multiple choice and true/false questions from images using direct LLM call."""
-    content = [{"type": "text", "text": "请识别以下图片中的所有题目，包括选择题和判断题。"}]
-    content.extend(build_image_content(image_paths))
-    
-    structured_llm = llm.with_structured_output(MixedResponse)
-    
-    messages = [
-        SystemMessage(content=MIXED_PROMPT),
-        HumanMessage(content=content)
-    ]
-    
-    result = structured_llm.invoke(messages)
-    
-    multiple_choice = [
-        ensure_question_id(
-            {
-                "title": q.title,
-                "options": {
-                    "a": q.options.a,
-                    "b": q.options.b,
-                    "c": q.options.c,
-                    "d": q.options.d,
-                },
-                "source_image": image_paths,
-            },
-            "multiple_choice",
-        )
-        for q in result.multiple_choice_questions
-    ]
-    
-    true_false = [
-        ensure_question_id({"title": q.title, "source_image": image_paths}, "true_false")
-        for q in result.true_false_questions
-    ]
-    
+    """Extract both multiple choice and true/false questions from images using direct LLM calls."""
+    structured_llm = _with_retry(llm.with_structured_output(MixedResponse))
+
+    multiple_choice = []
+    true_false = []
+    for chunk, result in _invoke_chunked(
+        structured_llm, MIXED_PROMPT, "请识别以下图片中的所有题目，包括选择题和判断题。", image_paths
+    ):
+        multiple_choice.extend(_mc_question_dict(q, chunk) for q in result.multiple_choice_questions)
+        true_false.extend(_tf_question_dict(q, chunk) for q in result.true_false_questions)
+
     return {
         "type": "mixed",
         "multiple_choice": multiple_choice,
@@ -380,6 +454,25 @@ def extract_mixed(llm: ChatOpenAI, image_paths: list[str]) -> dict:
 
 # ==================== LangChain Tool ====================
 
+@lru_cache(maxsize=4)
+def _get_vision_llm(api_key: str, base_url: str, model: str, max_tokens: int) -> ChatOpenAI:
+    """Get a shared ChatOpenAI vision client for the given configuration.
+
+    Constructing ChatOpenAI builds a fresh httpx client, TLS context, and
+    connection pool every time, throwing away warm connections between tool
+    calls. Caching on the configuration values lets repeated calls reuse the
+    same client and its keep-alive connections.
+    """
+    return ChatOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        temperature=0.1,
+        max_tokens=max_tokens,
+        use_responses_api=True,
+    )
+
+
 @tool
 def analyze_image(
     image_paths: str,
@@ -432,30 +525,43 @@ def analyze_image(
     try:
         # Get settings
         settings = get_settings()
-        
-        # Create LangChain ChatOpenAI client with custom base URL
-        llm = ChatOpenAI(
-            api_key=settings.doubao_api_key,
-            base_url=settings.doubao_base_url,
-            model=settings.doubao_model,
-            temperature=0.1,
-            max_tokens=settings.doubao_max_tokens,
-            use_responses_api=True,
-        )
-        
-        # Extract questions based on type
-        if question_type == "multiple_choice":
-            result_data = extract_multiple_choice(llm, valid_paths)
-            total_count = len(result_data["multiple_choice"])
-        elif question_type == "true_false":
-            result_data = extract_true_false(llm, valid_paths)
-            total_count = len(result_data["true_false"])
-        else:  # mixed
-            result_data = extract_mixed(llm, valid_paths)
+
+        # Check the recognition cache: identical images + type + model means
+        # the model would return the same questions, so skip the LLM call
+        cache_key = None
+        result_data = None
+        if settings.enable_recognition_cache:
+            cache_key = compute_cache_key(valid_paths, question_type, settings.doubao_model)
+            result_data = load_cached_result(cache_key, settings.recognition_cache_dir)
+
+        if result_data is None:
+            # Get the shared LangChain ChatOpenAI client
+            llm = _get_vision_llm(
+                settings.doubao_api_key,
+                settings.doubao_base_url,
+                settings.doubao_model,
+                settings.doubao_max_tokens,
+            )
+
+            # Extract questions based on type
+            if question_type == "multiple_choice":
+                result_data = extract_multiple_choice(llm, valid_paths)
+            elif question_type == "true_false":
+                result_data = extract_true_false(llm, valid_paths)
+            else:  # mixed
+                result_data = extract_mixed(llm, valid_paths)
+
+            if cache_key is not None:
+                store_cached_result(cache_key, result_data, settings.recognition_cache_dir)
+
+        # Count questions for the result message
+        if question_type == "mixed":
             mc_count = len(result_data["multiple_choice"])
             tf_count = len(result_data["true_false"])
             total_count = mc_count + tf_count
-        
+        else:
+            total_count = len(result_data[question_type])
+
         # Add processed images to result data
         result_data["processed_images"] = valid_paths
         
@@ -11,6 +11,8 @@ from typing import Any
 
 from langchain.tools import tool
 
+from src.utils.file_utils import dumps_json_bytes
+
 
 # ==================== Validation Rules ====================
 
@@ -454,10 +456,7 @@ def validate_questions_tool(
         if isinstance(original_data, dict):
             original_data["failed_question_ids"] = failed_ids
             try:
-                file_path.write_text(
-                    json.dumps(original_data, ensure_ascii=False, indent=2),
-                    encoding="utf-8",
-                )
+                file_path.write_bytes(dumps_json_bytes(original_data))
             except Exception:
                 lines.append("")
                 lines.append("Warning: Failed to write failed_question_ids back to JSON.")
@@ -468,10 +467,10 @@ def validate_questions_tool(
     if not isinstance(data, list):
         # Check if it's the unified structure
         if isinstance(data, dict) and ("multiple_choice" in data or "true_false" in data):
-             if question_type == "multiple_choice" and "multiple_choice" in data:
-                 data = data["multiple_choice"]
-             elif question_type == "true_false" and "true_false" in data:
-                 data = data["true_false"]
+             # Single .get per branch instead of membership test + re-index
+             selected = data.get(question_type) if question_type in ("multiple_choice", "true_false") else None
+             if selected is not None:
+                 data = selected
              else:
                  return f"Error: Input data does not contain '{question_type}' questions"
         else:
@@ -521,10 +520,7 @@ def validate_questions_tool(
     if isinstance(original_data, dict):
         original_data["failed_question_ids"] = failed_ids
         try:
-            file_path.write_text(
-                json.dumps(original_data, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            file_path.write_bytes(dumps_json_bytes(original_data))
         except Exception:
             lines.append("")
             lines.append("Warning: Failed to write failed_question_ids back to JSON.")
@@ -4,6 +4,7 @@ Utility modules for the question extraction agent.
 
 from .image_utils import (
     encode_image_to_base64,
+    make_data_url,
     get_image_mime_type,
     is_valid_image,
     get_image_paths_from_directory,
@@ -11,6 +12,7 @@ from .image_utils import (
 )
 from .file_utils import (
     ensure_directory,
+    dumps_json_bytes,
     read_json_file,
     write_json_file,
     get_unique_filename,
@@ -21,18 +23,30 @@ from .question_json_utils import (
     load_existing_questions
 )
 
+from .recognition_cache import (
+    compute_cache_key,
+    load_cached_result,
+    store_cached_result,
+)
+
 __all__ = [
     # Image utilities
     "encode_image_to_base64",
+    "make_data_url",
     "get_image_mime_type",
     "is_valid_image",
     "get_image_paths_from_directory",
     "SUPPORTED_IMAGE_EXTENSIONS",
     # File utilities
     "ensure_directory",
+    "dumps_json_bytes",
     "read_json_file",
     "write_json_file",
     "get_unique_filename",
     "is_valid_path",
-    "load_existing_questions"
+    "load_existing_questions",
+    # Recognition cache
+    "compute_cache_key",
+    "load_cached_result",
+    "store_cached_result",
 ]
@@ -10,6 +10,35 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    # orjson serializes large question lists several times faster than the
+    # stdlib and returns UTF-8 bytes directly
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps_json_bytes(data: Any, pretty: bool = True) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, using orjson when available.
+
+    Non-ASCII characters are kept as-is (equivalent to ensure_ascii=False);
+    pretty output uses 2-space indentation.
+
+    Args:
+        data: Data to serialize (must be JSON-serializable)
+        pretty: If True, indent the output with 2 spaces
+
+    Returns:
+        UTF-8 encoded JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, option=option)
+
+    indent = 2 if pretty else None
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
 
 def ensure_directory(path: str | Path) -> Path:
     """
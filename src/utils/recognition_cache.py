@@ -0,0 +1,97 @@
+"""
+Content-addressed cache for vision model recognition results.
+
+Re-running extraction on an image that was already processed re-uploads the
+image and pays for identical model work. This module memoizes recognition
+results on disk, keyed by a hash of the image bytes plus the question type
+and model, so repeat runs short-circuit the LLM call entirely.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from src.utils.file_utils import dumps_json_bytes
+
+# Default on-disk location for cached recognition results
+DEFAULT_CACHE_DIR = Path("~/.cache/image2questions")
+
+
+def compute_cache_key(
+    image_paths: list[str],
+    question_type: str,
+    model: str,
+) -> str:
+    """
+    Compute a content-addressed cache key for a recognition request.
+
+    The key hashes the raw bytes of every image (path-order independent),
+    the question type, and the model name, so a cache hit guarantees the
+    identical request was made before.
+
+    Args:
+        image_paths: Paths to the images in the request
+        question_type: Question type being extracted
+        model: Vision model name
+
+    Returns:
+        Hex digest usable as a cache filename
+
+    Raises:
+        FileNotFoundError: If any image file doesn't exist
+    """
+    hasher = hashlib.sha256()
+    for path in sorted(str(p) for p in image_paths):
+        hasher.update(Path(path).read_bytes())
+    hasher.update(question_type.encode("utf-8"))
+    hasher.update(model.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def load_cached_result(key: str, cache_dir: str | Path = DEFAULT_CACHE_DIR) -> dict | None:
+    """
+    Load a cached recognition result if one exists.
+
+    Args:
+        key: Cache key from compute_cache_key
+        cache_dir: Directory holding cached results
+
+    Returns:
+        The cached result dict, or None on miss or unreadable entry
+    """
+    cache_path = Path(cache_dir).expanduser() / f"{key}.json"
+
+    if not cache_path.exists():
+        return None
+
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else None
+    except (json.JSONDecodeError, OSError):
+        # A corrupt cache entry is treated as a miss
+        return None
+
+
+def store_cached_result(
+    key: str,
+    result: dict,
+    cache_dir: str | Path = DEFAULT_CACHE_DIR,
+) -> None:
+    """
+    Store a recognition result in the cache.
+
+    Failures to write are silently ignored: the cache is an optimization
+    and must never break the extraction flow.
+
+    Args:
+        key: Cache key from compute_cache_key
+        result: Recognition result dict to store
+        cache_dir: Directory holding cached results
+    """
+    try:
+        cache_directory = Path(cache_dir).expanduser()
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        cache_path = cache_directory / f"{key}.json"
+        cache_path.write_bytes(dumps_json_bytes(result, pretty=False))
+    except OSError:
+        pass
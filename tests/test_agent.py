@@ -13,6 +13,8 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from uuid import UUID
 
+from langchain_core.messages import AIMessage
+
 from src.agent import (
     QuestionExtractionAgent,
     create_question_extraction_agent,
@@ -25,6 +27,17 @@ from src.agent import (
 from src.agent.prompts import get_system_prompt as prompts_get_system_prompt
 
 
+@pytest.fixture(autouse=True)
+def clear_compiled_agent_cache():
+    """Reset the compiled-agent cache so each test builds through its own mocks."""
+    from src.agent.agent import _build_compiled_agent, _default_extraction_agent
+    _build_compiled_agent.cache_clear()
+    _default_extraction_agent.cache_clear()
+    yield
+    _build_compiled_agent.cache_clear()
+    _default_extraction_agent.cache_clear()
+
+
 # =============================================================================
 # Test: Prompts
 # =============================================================================
@@ -162,6 +175,46 @@ class TestAgentInitialization:
         create_call_kwargs = mock_create_agent.call_args[1]
         assert create_call_kwargs["checkpointer"] is not None
     
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_same_config_reuses_compiled_agent(self, mock_create_agent, mock_chat_openai):
+        """Test that identical configurations share one compiled agent."""
+        mock_create_agent.return_value = MagicMock()
+
+        agent1 = QuestionExtractionAgent()
+        agent2 = QuestionExtractionAgent()
+
+        # The graph is compiled once and reused
+        mock_create_agent.assert_called_once()
+        assert agent1.agent is agent2.agent
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_agent_uses_context_editing_middleware(self, mock_create_agent, mock_chat_openai):
+        """Test that the context-trim middleware is configured."""
+        from langchain.agents.middleware import ContextEditingMiddleware
+
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent()
+
+        middleware = mock_create_agent.call_args[1]["middleware"]
+        assert any(isinstance(m, ContextEditingMiddleware) for m in middleware)
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_dedup_middleware_runs_before_context_editing(self, mock_create_agent, mock_chat_openai):
+        """Test that dedup precedes the trim so the trigger sees reduced sizes."""
+        from src.agent.agent import CJKContextEditingMiddleware, DeduplicateToolOutputMiddleware
+
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent()
+
+        middleware = mock_create_agent.call_args[1]["middleware"]
+        types = [type(m) for m in middleware]
+        assert types.index(DeduplicateToolOutputMiddleware) < types.index(CJKContextEditingMiddleware)
+
     @patch("src.agent.agent.ChatAnthropic")
     @patch("src.agent.agent.ChatOpenAI")
     @patch("src.agent.agent.create_agent")
@@ -182,6 +235,197 @@ class TestAgentInitialization:
 
 
 
+# =============================================================================
+# Test: Tool Output Deduplication
+# =============================================================================
+
+class TestDeduplicateToolOutputMiddleware:
+    """Tests for the duplicate-tool-output middleware."""
+
+    @staticmethod
+    def _tool_turn(call_id, msg_id, args, content):
+        """Build an AI tool-call message and its tool result."""
+        from langchain_core.messages import AIMessage, ToolMessage
+
+        ai = AIMessage(
+            content="",
+            tool_calls=[{"name": "analyze_image", "args": args, "id": call_id}],
+        )
+        tool = ToolMessage(content=content, tool_call_id=call_id, id=msg_id)
+        return [ai, tool]
+
+    def test_older_duplicate_output_is_rewritten(self):
+        """Test that only the latest result for identical args keeps its content."""
+        from src.agent.agent import (
+            DeduplicateToolOutputMiddleware,
+            _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER,
+        )
+
+        messages = (
+            self._tool_turn("c1", "t1", {"image_path": "a.jpg"}, "first big result")
+            + self._tool_turn("c2", "t2", {"image_path": "a.jpg"}, "second big result")
+        )
+
+        update = DeduplicateToolOutputMiddleware().before_model({"messages": messages})
+
+        assert update is not None
+        replaced = update["messages"]
+        assert len(replaced) == 1
+        assert replaced[0].id == "t1"
+        assert replaced[0].content == _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER
+
+    def test_distinct_args_are_untouched(self):
+        """Test that different arguments never trigger a rewrite."""
+        from src.agent.agent import DeduplicateToolOutputMiddleware
+
+        messages = (
+            self._tool_turn("c1", "t1", {"image_path": "a.jpg"}, "result a")
+            + self._tool_turn("c2", "t2", {"image_path": "b.jpg"}, "result b")
+        )
+
+        assert DeduplicateToolOutputMiddleware().before_model({"messages": messages}) is None
+
+    def test_already_cleared_output_is_not_rewritten_again(self):
+        """Test that placeholder content does not produce repeat updates."""
+        from src.agent.agent import (
+            DeduplicateToolOutputMiddleware,
+            _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER,
+        )
+
+        messages = (
+            self._tool_turn(
+                "c1", "t1", {"image_path": "a.jpg"}, _DUPLICATE_TOOL_OUTPUT_PLACEHOLDER
+            )
+            + self._tool_turn("c2", "t2", {"image_path": "a.jpg"}, "latest result")
+        )
+
+        assert DeduplicateToolOutputMiddleware().before_model({"messages": messages}) is None
+
+
+# =============================================================================
+# Test: Zone-Based Tool Result Pruning
+# =============================================================================
+
+class TestZonedToolResultMiddleware:
+    """Tests for the recency-zone pruning middleware."""
+
+    @staticmethod
+    def _tool_messages(contents):
+        """Build one ToolMessage per content string, oldest first."""
+        from langchain_core.messages import ToolMessage
+
+        return [
+            ToolMessage(content=c, tool_call_id=f"c{i}", id=f"t{i}", name="analyze_image")
+            for i, c in enumerate(contents)
+        ]
+
+    def _middleware(self):
+        from src.agent.agent import ZonedToolResultMiddleware
+
+        return ZonedToolResultMiddleware(protect_recent=1, trim_zone=1, advance_step=1)
+
+    def test_protected_zone_is_untouched(self):
+        """Test that the newest tool result is never rewritten."""
+        messages = self._tool_messages(["x" * 1000])
+
+        assert self._middleware().before_model({"messages": messages}) is None
+
+    def test_trim_zone_keeps_head_and_tail(self):
+        """Test that the trim zone reduces long content to excerpts."""
+        long_content = "head" + "x" * 1000 + "tail"
+        messages = self._tool_messages([long_content, "newest"])
+
+        update = self._middleware().before_model({"messages": messages})
+
+        (trimmed,) = update["messages"]
+        assert trimmed.id == "t0"
+        assert trimmed.content.startswith("head")
+        assert trimmed.content.endswith("tail")
+        assert len(trimmed.content) < len(long_content)
+
+    def test_mask_zone_replaces_content_with_placeholder(self):
+        """Test that the mask zone reduces results to a one-line marker."""
+        messages = self._tool_messages(["oldest big result", "middle", "newest"])
+
+        update = self._middleware().before_model({"messages": messages})
+
+        masked = next(m for m in update["messages"] if m.id == "t0")
+        assert "archived" in masked.content
+
+    def test_oldest_results_are_masked_not_removed(self):
+        """Test that even the oldest results keep their tool_call pairing."""
+        from langchain_core.messages import ToolMessage
+
+        messages = self._tool_messages(["ancient", "old", "middle", "newest"])
+
+        update = self._middleware().before_model({"messages": messages})
+
+        oldest = next(m for m in update["messages"] if m.id == "t0")
+        assert isinstance(oldest, ToolMessage)
+        assert oldest.tool_call_id == "c0"
+        assert "archived" in oldest.content
+
+    def test_cut_advances_in_steps(self):
+        """Test that rewrites wait for a full step of new results."""
+        from src.agent.agent import ZonedToolResultMiddleware
+
+        middleware = ZonedToolResultMiddleware(protect_recent=1, trim_zone=1, advance_step=4)
+        messages = self._tool_messages(["a" * 1000, "b" * 1000, "c" * 1000, "newest"])
+
+        # Three results past the protected one: below a full step, so the
+        # history must stay byte-identical for prompt-cache stability
+        assert middleware.before_model({"messages": messages}) is None
+
+    def test_non_tool_messages_are_never_touched(self):
+        """Test that human/AI/system turns pass through untouched."""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        messages = [
+            SystemMessage(content="system prompt", id="s0"),
+            HumanMessage(content="question", id="h0"),
+        ] + self._tool_messages(["only tool result"])
+
+        assert self._middleware().before_model({"messages": messages}) is None
+
+    def test_protected_flag_pins_a_result(self):
+        """Test that additional_kwargs['protected'] exempts a result."""
+        messages = self._tool_messages(["oldest", "middle", "newest"])
+        messages[0].additional_kwargs["protected"] = True
+
+        update = self._middleware().before_model({"messages": messages})
+
+        touched_ids = {m.id for m in update["messages"]} if update else set()
+        assert "t0" not in touched_ids
+
+
+# =============================================================================
+# Test: Token Estimation
+# =============================================================================
+
+class TestTokenEstimation:
+    """Tests for the CJK-aware token estimator."""
+
+    def test_cjk_text_counts_more_per_char(self):
+        """Test that CJK characters are weighted heavier than ASCII."""
+        from src.agent.agent import count_tokens_cjk
+
+        ascii_msg = MagicMock(content="a" * 100)
+        cjk_msg = MagicMock(content="题" * 100)
+
+        assert count_tokens_cjk([cjk_msg]) > count_tokens_cjk([ascii_msg])
+
+    def test_counts_text_parts_in_list_content(self):
+        """Test that structured content lists are counted too."""
+        from src.agent.agent import count_tokens_cjk
+
+        message = MagicMock(content=[
+            {"type": "text", "text": "选择题" * 10},
+            {"type": "input_image", "image_url": "data:..."},
+        ])
+
+        assert count_tokens_cjk([message]) > 0
+
+
 # =============================================================================
 # Test: Thread Management
 # =============================================================================
@@ -194,13 +438,34 @@ class TestThreadManagement:
     def test_thread_id_auto_generated(self, mock_create_agent, mock_chat_openai):
         """Test that thread_id is auto-generated on first access."""
         mock_create_agent.return_value = MagicMock()
-        
+
         agent = QuestionExtractionAgent()
-        
+
         thread_id = agent.thread_id
         assert thread_id is not None
-        # Should be a valid UUID string
-        UUID(thread_id)  # Will raise if invalid
+        assert isinstance(thread_id, str)
+        assert len(thread_id) > 0
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_secure_thread_ids_are_uuids(self, mock_create_agent, mock_chat_openai):
+        """Test that secure_thread_ids=True generates full UUIDs."""
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent(secure_thread_ids=True)
+
+        UUID(agent.thread_id)  # Will raise if invalid
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_generated_thread_ids_are_unique(self, mock_create_agent, mock_chat_openai):
+        """Test that successive conversations never reuse a thread id."""
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent()
+
+        ids = {agent.new_conversation() for _ in range(100)}
+        assert len(ids) == 100
     
     @patch("src.agent.agent.ChatOpenAI")
     @patch("src.agent.agent.create_agent")
@@ -231,6 +496,88 @@ class TestThreadManagement:
         assert thread_id1 != thread_id2
 
 
+# =============================================================================
+# Test: LRU Checkpointer
+# =============================================================================
+
+class TestLRUInMemorySaver:
+    """Tests for the bounded LRU checkpointer."""
+
+    @staticmethod
+    def _put(saver, thread_id):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        checkpoint = {"id": f"ckpt-{thread_id}", "channel_values": {}}
+        saver.put(config, checkpoint, {}, {})
+
+    def test_evicts_oldest_thread_beyond_limit(self):
+        """Test that the least-recently-used thread is dropped."""
+        from src.agent.agent import LRUInMemorySaver
+
+        saver = LRUInMemorySaver(max_threads=2)
+        self._put(saver, "t1")
+        self._put(saver, "t2")
+        self._put(saver, "t3")
+
+        assert "t1" not in saver.storage
+        assert "t2" in saver.storage
+        assert "t3" in saver.storage
+
+    def test_recent_write_refreshes_thread(self):
+        """Test that writing to a thread protects it from eviction."""
+        from src.agent.agent import LRUInMemorySaver
+
+        saver = LRUInMemorySaver(max_threads=2)
+        self._put(saver, "t1")
+        self._put(saver, "t2")
+        self._put(saver, "t1")  # refresh t1
+        self._put(saver, "t3")
+
+        assert "t1" in saver.storage
+        assert "t2" not in saver.storage
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_agent_lru_checkpointer_option(self, mock_create_agent, mock_chat_openai):
+        """Test that checkpointer='lru' builds a bounded saver."""
+        from src.agent.agent import LRUInMemorySaver
+
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent(checkpointer="lru")
+
+        assert isinstance(agent.checkpointer, LRUInMemorySaver)
+
+
+# =============================================================================
+# Test: Loop-Bound Async HTTP Client
+# =============================================================================
+
+class TestLoopBoundAsyncClient:
+    """Tests for the per-event-loop async HTTP client."""
+
+    def test_fresh_delegate_per_event_loop(self):
+        """Test that each asyncio.run gets its own connection pool."""
+        import asyncio
+
+        import httpx
+
+        from src.agent.agent import _LoopBoundAsyncClient
+
+        client = _LoopBoundAsyncClient()
+
+        async def probe():
+            with patch.object(httpx.AsyncClient, "send", AsyncMock(return_value=None)):
+                await client.send(client.build_request("GET", "http://example.invalid/"))
+            return client._delegates[asyncio.get_running_loop()]
+
+        first = asyncio.run(probe())
+        second = asyncio.run(probe())
+
+        assert first is not second
+        # the pool stranded on the first, now-closed loop was dropped
+        assert len(client._delegates) == 1
+
+
 # =============================================================================
 # Test: Chat Method
 # =============================================================================
@@ -244,7 +591,7 @@ class TestChatMethod:
         """Test that chat method invokes the agent."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Test response")]
+            "messages": [AIMessage(content="Test response")]
         }
         mock_create_agent.return_value = mock_agent
         
@@ -265,7 +612,7 @@ class TestChatMethod:
         """Test that chat passes thread_id in config."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Response")]
+            "messages": [AIMessage(content="Response")]
         }
         mock_create_agent.return_value = mock_agent
         
@@ -282,8 +629,7 @@ class TestChatMethod:
     @patch("src.agent.agent.create_agent")
     def test_chat_extracts_response_content(self, mock_create_agent, mock_chat_openai):
         """Test that chat extracts content from response."""
-        mock_message = MagicMock()
-        mock_message.content = "Extracted response"
+        mock_message = AIMessage(content="Extracted response")
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {"messages": [mock_message]}
         mock_create_agent.return_value = mock_agent
@@ -294,6 +640,24 @@ class TestChatMethod:
         assert response.message == "Extracted response"
         assert response.success == True
     
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_chat_parses_structured_json_content(self, mock_create_agent, mock_chat_openai):
+        """Test that valid JSON content is parsed into an AgentResponse."""
+        mock_message = AIMessage(
+            content='{"success": true, "message": "提取完成", "operation": "extract"}'
+        )
+        mock_agent = MagicMock()
+        mock_agent.invoke.return_value = {"messages": [mock_message]}
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        response = agent.chat("Test")
+
+        assert response.success is True
+        assert response.message == "提取完成"
+        assert response.operation == "extract"
+
     @patch("src.agent.agent.ChatOpenAI")
     @patch("src.agent.agent.create_agent")
     def test_chat_handles_empty_response(self, mock_create_agent, mock_chat_openai):
@@ -308,13 +672,31 @@ class TestChatMethod:
         assert response.message == "No response generated."
         assert response.success == False
     
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_achat_awaits_agent(self, mock_create_agent, mock_chat_openai):
+        """Test that achat awaits the agent's native ainvoke."""
+        import asyncio
+
+        mock_agent = MagicMock()
+        mock_agent.ainvoke = AsyncMock(return_value={
+            "messages": [AIMessage(content="Async response")]
+        })
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        response = asyncio.run(agent.achat("Test message"))
+
+        mock_agent.ainvoke.assert_awaited_once()
+        assert response.message == "Async response"
+
     @patch("src.agent.agent.ChatOpenAI")
     @patch("src.agent.agent.create_agent")
     def test_chat_with_custom_thread_id(self, mock_create_agent, mock_chat_openai):
         """Test chat with custom thread_id."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Response")]
+            "messages": [AIMessage(content="Response")]
         }
         mock_create_agent.return_value = mock_agent
         
@@ -337,7 +719,7 @@ class TestInvokeMethod:
     def test_invoke_returns_full_result(self, mock_create_agent, mock_chat_openai):
         """Test that invoke returns the full result dict."""
         expected_result = {
-            "messages": [MagicMock(content="Response")],
+            "messages": [AIMessage(content="Response")],
             "some_other_key": "value"
         }
         mock_agent = MagicMock()
@@ -350,6 +732,120 @@ class TestInvokeMethod:
         assert result == expected_result
 
 
+# =============================================================================
+# Test: Conversation History
+# =============================================================================
+
+class TestConversationHistory:
+    """Tests for get_conversation_history."""
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_lite_history_returns_slim_dicts(self, mock_create_agent, mock_chat_openai):
+        """Test that lite=True returns role/content dicts only."""
+        message = MagicMock(type="human", content="你好")
+        mock_agent = MagicMock()
+        mock_agent.get_state.return_value = MagicMock(values={"messages": [message]})
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        history = agent.get_conversation_history(lite=True)
+
+        assert history == [{"role": "human", "content": "你好"}]
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_default_history_returns_messages(self, mock_create_agent, mock_chat_openai):
+        """Test that the default returns the raw message objects."""
+        message = MagicMock(type="ai", content="response")
+        mock_agent = MagicMock()
+        mock_agent.get_state.return_value = MagicMock(values={"messages": [message]})
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        history = agent.get_conversation_history()
+
+        assert history == [message]
+
+
+# =============================================================================
+# Test: Batch Methods
+# =============================================================================
+
+class TestBatchMethods:
+    """Tests for the batch and abatch methods."""
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_batch_dispatches_all_messages(self, mock_create_agent, mock_chat_openai):
+        """Test that batch dispatches every message with its own thread."""
+        mock_agent = MagicMock()
+        mock_agent.batch.return_value = [
+            {"messages": [AIMessage(content="Response 1")]},
+            {"messages": [AIMessage(content="Response 2")]},
+        ]
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        responses = agent.batch(["Message 1", "Message 2"])
+
+        assert len(responses) == 2
+        assert responses[0].message == "Response 1"
+        assert responses[1].message == "Response 2"
+
+        # Each message gets a distinct auto-generated thread_id
+        inputs, = mock_agent.batch.call_args[0]
+        configs = mock_agent.batch.call_args[1]["config"]
+        assert len(inputs) == 2
+        thread_ids = {c["configurable"]["thread_id"] for c in configs}
+        assert len(thread_ids) == 2
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_batch_with_explicit_thread_ids(self, mock_create_agent, mock_chat_openai):
+        """Test that batch honors caller-provided thread_ids."""
+        mock_agent = MagicMock()
+        mock_agent.batch.return_value = [
+            {"messages": [AIMessage(content="Response")]},
+        ]
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        agent.batch(["Message"], thread_ids=["my-thread"])
+
+        configs = mock_agent.batch.call_args[1]["config"]
+        assert configs[0]["configurable"]["thread_id"] == "my-thread"
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_batch_rejects_mismatched_thread_ids(self, mock_create_agent, mock_chat_openai):
+        """Test that batch rejects thread_ids of the wrong length."""
+        mock_create_agent.return_value = MagicMock()
+
+        agent = QuestionExtractionAgent()
+
+        with pytest.raises(ValueError):
+            agent.batch(["Message 1", "Message 2"], thread_ids=["only-one"])
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_abatch_awaits_agent(self, mock_create_agent, mock_chat_openai):
+        """Test that abatch awaits the agent's native abatch."""
+        import asyncio
+
+        mock_agent = MagicMock()
+        mock_agent.abatch = AsyncMock(return_value=[
+            {"messages": [AIMessage(content="Async response")]},
+        ])
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        responses = asyncio.run(agent.abatch(["Message"]))
+
+        mock_agent.abatch.assert_awaited_once()
+        assert responses[0].message == "Async response"
+
+
 # =============================================================================
 # Test: Stream Method
 # =============================================================================
@@ -369,9 +865,22 @@ class TestStreamMethod:
         agent = QuestionExtractionAgent()
         
         result_chunks = list(agent.stream("Test"))
-        
+
         assert result_chunks == chunks
 
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_stream_uses_update_deltas(self, mock_create_agent, mock_chat_openai):
+        """Test that streaming requests per-node deltas, not full state."""
+        mock_agent = MagicMock()
+        mock_agent.stream.return_value = iter([])
+        mock_create_agent.return_value = mock_agent
+
+        agent = QuestionExtractionAgent()
+        list(agent.stream("Test"))
+
+        assert mock_agent.stream.call_args[1]["stream_mode"] == "updates"
+
 
 # =============================================================================
 # Test: Factory Functions
@@ -399,15 +908,54 @@ class TestFactoryFunctions:
         """Test extract_questions convenience function."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Extracted 5 questions")]
+            "messages": [AIMessage(content="Extracted 5 questions")]
         }
         mock_create_agent.return_value = mock_agent
         
         result = extract_questions("Extract from test.jpg")
-        
+
         assert result.message == "Extracted 5 questions"
         assert result.success == True
 
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_extract_questions_drops_thread(self, mock_create_agent, mock_chat_openai):
+        """Test that single-turn extraction does not retain its thread."""
+        from src.agent.agent import _DEFAULT_CHECKPOINTER
+
+        mock_agent = MagicMock()
+        mock_agent.invoke.return_value = {
+            "messages": [AIMessage(content="Extracted 1 question")]
+        }
+        mock_create_agent.return_value = mock_agent
+
+        with patch.object(
+            _DEFAULT_CHECKPOINTER, "delete_thread",
+            wraps=_DEFAULT_CHECKPOINTER.delete_thread,
+        ) as mock_delete:
+            extract_questions("Extract from test.jpg")
+
+        mock_delete.assert_called_once()
+
+    @patch("src.agent.agent.ChatOpenAI")
+    @patch("src.agent.agent.create_agent")
+    def test_aextract_questions_convenience(self, mock_create_agent, mock_chat_openai):
+        """Test aextract_questions async convenience function."""
+        import asyncio
+
+        from src.agent import aextract_questions
+
+        mock_agent = MagicMock()
+        mock_agent.ainvoke = AsyncMock(return_value={
+            "messages": [AIMessage(content="Extracted 2 questions")]
+        })
+        mock_create_agent.return_value = mock_agent
+
+        result = asyncio.run(aextract_questions("Extract from test.jpg"))
+
+        assert result.message == "Extracted 2 questions"
+        assert result.success == True
+
 
 # =============================================================================
 # Test: Tools Integration
@@ -457,7 +1005,7 @@ class TestMemoryBehavior:
         """Test that same thread_id preserves conversation context."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Response")]
+            "messages": [AIMessage(content="Response")]
         }
         mock_create_agent.return_value = mock_agent
         
@@ -480,7 +1028,7 @@ class TestMemoryBehavior:
         """Test that new_conversation creates new thread."""
         mock_agent = MagicMock()
         mock_agent.invoke.return_value = {
-            "messages": [MagicMock(content="Response")]
+            "messages": [AIMessage(content="Response")]
         }
         mock_create_agent.return_value = mock_agent
         
@@ -4,6 +4,8 @@ Tests for Pydantic data models.
 This module tests the question models, validation, and serialization.
 """
 
+import json
+
 import pytest
 from datetime import datetime
 
@@ -17,6 +19,8 @@ from src.models.questions import (
     ValidationIssue,
     ValidationReport,
     ExtractionResult,
+    parse_mc_questions,
+    parse_tf_questions,
 )
 
 
@@ -234,7 +238,11 @@ class TestExtractionResult:
         assert result.success is True
         assert result.question_count == 1
         assert len(result.source_images) == 2
-        assert isinstance(result.extracted_at, datetime)
+        # The timestamp is deferred until the result is dumped; both dump
+        # paths stamp it
+        assert result.extracted_at is None
+        assert isinstance(result.model_dump()["extracted_at"], datetime)
+        assert json.loads(result.model_dump_json())["extracted_at"] is not None
     
     def test_failed_extraction(self):
         """Test creating a failed extraction result."""
@@ -242,7 +250,69 @@ class TestExtractionResult:
             success=False,
             error_message="Failed to process image"
         )
-        
+
         assert result.success is False
         assert result.question_count == 0
         assert result.error_message == "Failed to process image"
+
+
+class TestListAdapters:
+    """Tests for the batch list-validation helpers."""
+
+    def test_parse_mc_questions(self):
+        """Test validating a list of multiple-choice dicts in one call."""
+        questions = parse_mc_questions([
+            {"title": "Q1", "options": {"a": "1", "b": "2", "c": "3", "d": "4"}},
+            {"title": "Q2"},
+        ])
+
+        assert len(questions) == 2
+        assert all(isinstance(q, MultipleChoiceQuestion) for q in questions)
+
+    def test_parse_mc_questions_still_validates(self):
+        """Test that the adapter applies the model validators."""
+        with pytest.raises(Exception):
+            parse_mc_questions([{"title": "   "}])
+
+    def test_parse_tf_questions(self):
+        """Test validating a list of true/false dicts in one call."""
+        questions = parse_tf_questions([{"title": "The sky is blue"}])
+
+        assert len(questions) == 1
+        assert isinstance(questions[0], TrueFalseQuestion)
+
+
+class TestFromTrusted:
+    """Tests for the validation-skipping from_trusted constructors."""
+
+    def test_multiple_choice_from_trusted(self):
+        """Test building a question from pre-validated data."""
+        question = MultipleChoiceQuestion.from_trusted({
+            "title": "What is 2+2?",
+            "options": {"a": "3", "b": "4", "c": "5", "d": "6"},
+        })
+
+        assert question.title == "What is 2+2?"
+        assert isinstance(question.options, MultipleChoiceOptions)
+        assert question.options.b == "4"
+
+    def test_from_trusted_skips_validators(self):
+        """Test that from_trusted does not run field validators."""
+        # An empty title would be rejected by normal construction
+        question = TrueFalseQuestion.from_trusted({"title": ""})
+
+        assert question.title == ""
+
+    def test_extraction_result_from_trusted_dispatches_types(self):
+        """Test that nested questions dispatch on question_type."""
+        result = ExtractionResult.from_trusted({
+            "success": True,
+            "questions": [
+                {"title": "MC", "options": {"a": "1", "b": "2", "c": "3", "d": "4"}},
+                {"title": "TF", "question_type": QuestionType.TRUE_FALSE},
+            ],
+        })
+
+        assert result.success is True
+        assert isinstance(result.questions[0], MultipleChoiceQuestion)
+        assert isinstance(result.questions[1], TrueFalseQuestion)
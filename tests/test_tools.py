@@ -397,12 +397,26 @@ class TestToolsIntegration:
     def test_tool_has_name_and_description(self):
         """Test that tools have proper names and descriptions."""
         from src.tools import get_all_tools
-        
+
         for tool in get_all_tools():
             assert hasattr(tool, "name")
             assert hasattr(tool, "description")
             assert tool.name
             assert tool.description
+
+    def test_get_all_tools_returns_shared_list(self):
+        """Test that repeat calls reuse the import-time tool list."""
+        from src.tools import get_all_tools
+
+        assert get_all_tools() is get_all_tools()
+
+    def test_get_tool_map_indexes_tools_by_name(self):
+        """Test that the tool map covers every tool under its name."""
+        from src.tools import get_all_tools, get_tool_map
+
+        tool_map = get_tool_map()
+        for tool in get_all_tools():
+            assert tool_map[tool.name] is tool
     
     def test_workflow_validate_questions(self, tmp_path):
         """Test workflow: validate questions."""
@@ -515,6 +529,44 @@ class TestImageAnalysisHelpers:
         assert content[0]["type"] == "input_image"
         assert "data:image/png;base64," in content[0]["image_url"]
 
+    def test_build_image_content_preserves_order(self, tmp_path):
+        """Test that parallel encoding keeps the input path order."""
+        paths = []
+        for i in range(5):
+            image_path = tmp_path / f"test_{i}.png"
+            image_path.write_bytes(f"image data {i}".encode())
+            paths.append(str(image_path))
+
+        content = build_image_content(paths)
+
+        assert len(content) == 5
+        import base64
+        for i, item in enumerate(content):
+            encoded = item["image_url"].split("base64,", 1)[1]
+            assert base64.standard_b64decode(encoded) == f"image data {i}".encode()
+
+    def test_build_image_content_empty(self):
+        """Test building image content with no paths."""
+        assert build_image_content([]) == []
+
+    def test_strip_leading_number(self):
+        """Test stripping leading question numbering from titles."""
+        from src.tools.image_analysis import strip_leading_number
+
+        assert strip_leading_number("1. What is 2+2?") == "What is 2+2?"
+        assert strip_leading_number("12) Capital of France?") == "Capital of France?"
+        assert strip_leading_number("3、这是一道选择题") == "这是一道选择题"
+        assert strip_leading_number("4．判断题内容") == "判断题内容"
+
+    def test_strip_leading_number_no_number(self):
+        """Test titles without numbering are unchanged."""
+        from src.tools.image_analysis import strip_leading_number
+
+        assert strip_leading_number("What is 2+2?") == "What is 2+2?"
+        assert strip_leading_number("") == ""
+        # Numbers inside the title are kept
+        assert strip_leading_number("Is 4 the answer to 2+2?") == "Is 4 the answer to 2+2?"
+
 
 class TestImageAnalysisPydanticModels:
     """Tests for Pydantic models used in image analysis."""
@@ -651,6 +703,7 @@ class TestExtractFunctions:
         mock_llm = MagicMock()
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         # Mock the invoke response
         mock_structured_llm.invoke.return_value = MultipleChoiceResponse(
@@ -685,6 +738,7 @@ class TestExtractFunctions:
         mock_llm = MagicMock()
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         # Mock the invoke response
         mock_structured_llm.invoke.return_value = TrueFalseResponse(
@@ -711,6 +765,7 @@ class TestExtractFunctions:
         mock_llm = MagicMock()
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         # Mock the invoke response
         mock_structured_llm.invoke.return_value = MixedResponse(
@@ -750,6 +805,7 @@ class TestExtractFunctions:
         mock_llm = MagicMock()
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         # Mock the invoke response
         mock_structured_llm.invoke.return_value = MixedResponse(
@@ -766,10 +822,48 @@ class TestExtractFunctions:
         assert len(result["multiple_choice"]) == 0
         assert len(result["true_false"]) == 1
 
+    def test_extract_multiple_choice_fans_out_over_chunks(self):
+        """Test that more images than one chunk are split into parallel requests."""
+        from src.tools.image_analysis import IMAGE_CHUNK_SIZE
+
+        mock_llm = MagicMock()
+        mock_structured_llm = MagicMock()
+        mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
+
+        # Two chunks worth of images -> batch is used instead of invoke
+        paths = [f"fake_{i}.png" for i in range(IMAGE_CHUNK_SIZE + 1)]
+        mock_structured_llm.batch.return_value = [
+            MultipleChoiceResponse(questions=[
+                MultipleChoiceItem(title="From chunk 1?", options=Options(a="1", b="2", c="3", d="4")),
+            ]),
+            MultipleChoiceResponse(questions=[
+                MultipleChoiceItem(title="From chunk 2?", options=Options(a="1", b="2", c="3", d="4")),
+            ]),
+        ]
+
+        with patch("src.tools.image_analysis.build_image_content", return_value=[]):
+            result = extract_multiple_choice(mock_llm, paths)
+
+        mock_structured_llm.invoke.assert_not_called()
+        assert mock_structured_llm.batch.call_count == 1
+        assert len(result["multiple_choice"]) == 2
+        # Each question is attributed to the chunk it came from
+        assert result["multiple_choice"][0]["source_image"] == paths[:IMAGE_CHUNK_SIZE]
+        assert result["multiple_choice"][1]["source_image"] == paths[IMAGE_CHUNK_SIZE:]
+
 
 class TestAnalyzeImageToolWithMocking:
     """Integration tests for analyze_image tool with mocked dependencies."""
-    
+
+    @pytest.fixture(autouse=True)
+    def clear_vision_llm_cache(self):
+        """Reset the cached vision client so each test sees its own mock."""
+        from src.tools.image_analysis import _get_vision_llm
+        _get_vision_llm.cache_clear()
+        yield
+        _get_vision_llm.cache_clear()
+
     @patch("src.tools.image_analysis.ChatOpenAI")
     @patch("src.tools.image_analysis.get_settings")
     def test_analyze_multiple_choice_success(self, mock_get_settings, mock_chat_openai_class, tmp_path):
@@ -780,6 +874,7 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         # Setup mock LangChain ChatOpenAI client
@@ -787,6 +882,7 @@ class TestAnalyzeImageToolWithMocking:
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.return_value = MultipleChoiceResponse(
             questions=[
@@ -818,12 +914,14 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         mock_llm = MagicMock()
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.return_value = TrueFalseResponse(
             questions=[
@@ -855,12 +953,14 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         mock_llm = MagicMock()
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.return_value = MixedResponse(
             multiple_choice_questions=[
@@ -895,12 +995,14 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         mock_llm = MagicMock()
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.return_value = MixedResponse(
             multiple_choice_questions=[
@@ -930,12 +1032,14 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         mock_llm = MagicMock()
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.return_value = MultipleChoiceResponse(
             questions=[
@@ -969,12 +1073,14 @@ class TestAnalyzeImageToolWithMocking:
         mock_settings.doubao_base_url = "https://test.api"
         mock_settings.doubao_model = "test-model"
         mock_settings.doubao_max_tokens = 4096
+        mock_settings.enable_recognition_cache = False
         mock_get_settings.return_value = mock_settings
         
         mock_llm = MagicMock()
         mock_chat_openai_class.return_value = mock_llm
         mock_structured_llm = MagicMock()
         mock_llm.with_structured_output.return_value = mock_structured_llm
+        mock_structured_llm.with_retry.return_value = mock_structured_llm
         
         mock_structured_llm.invoke.side_effect = Exception("API Error")
         
@@ -990,3 +1096,73 @@ class TestAnalyzeImageToolWithMocking:
         
         assert "Error during image analysis" in result
         assert "API Error" in result
+
+
+class TestBatchApi:
+    """Tests for the Batch API request building and output parsing."""
+
+    def test_build_batch_request_lines(self, tmp_path):
+        """Test one request line is built per chunk with the right shape."""
+        from src.tools.batch_api import build_batch_request_lines
+        from src.tools.image_analysis import IMAGE_CHUNK_SIZE
+
+        paths = []
+        for i in range(IMAGE_CHUNK_SIZE + 1):
+            image_path = tmp_path / f"img_{i}.png"
+            image_path.write_bytes(b"fake image data")
+            paths.append(str(image_path))
+
+        lines, chunk_map = build_batch_request_lines(paths, "mixed", "test-model")
+
+        assert len(lines) == 2
+        assert chunk_map["chunk-0"] == paths[:IMAGE_CHUNK_SIZE]
+        assert chunk_map["chunk-1"] == paths[IMAGE_CHUNK_SIZE:]
+
+        request = json.loads(lines[0])
+        assert request["custom_id"] == "chunk-0"
+        assert request["method"] == "POST"
+        assert request["url"] == "/v1/chat/completions"
+        assert request["body"]["model"] == "test-model"
+        assert request["body"]["response_format"]["type"] == "json_schema"
+
+    def test_parse_batch_output_line(self):
+        """Test parsing a successful batch output line into questions."""
+        from src.tools.batch_api import parse_batch_output_line
+
+        content = json.dumps({
+            "multiple_choice_questions": [
+                {"title": "1. What is 2+2?", "options": {"a": "3", "b": "4", "c": "5", "d": "6"}}
+            ],
+            "true_false_questions": [{"title": "The sky is blue."}],
+        })
+        line = json.dumps({
+            "custom_id": "chunk-0",
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": content}}]},
+            },
+        })
+
+        result = parse_batch_output_line(line, "mixed", {"chunk-0": ["a.png"]})
+
+        assert len(result["multiple_choice"]) == 1
+        # Leading numbering is stripped like in the interactive path
+        assert result["multiple_choice"][0]["title"] == "What is 2+2?"
+        assert result["multiple_choice"][0]["source_image"] == ["a.png"]
+        assert "id" in result["multiple_choice"][0]
+        assert len(result["true_false"]) == 1
+        assert result["true_false"][0]["title"] == "The sky is blue."
+
+    def test_parse_batch_output_line_error(self):
+        """Test a failed request line yields no questions."""
+        from src.tools.batch_api import parse_batch_output_line
+
+        line = json.dumps({
+            "custom_id": "chunk-0",
+            "response": {"status_code": 500, "body": {}},
+            "error": {"message": "server error"},
+        })
+
+        result = parse_batch_output_line(line, "mixed", {"chunk-0": ["a.png"]})
+
+        assert result == {"multiple_choice": [], "true_false": []}
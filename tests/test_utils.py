@@ -4,6 +4,7 @@ Tests for utility modules.
 This module tests image and file utility functions.
 """
 
+import io
 import json
 from pathlib import Path
 
@@ -11,6 +12,7 @@ import pytest
 
 from src.utils.image_utils import (
     encode_image_to_base64,
+    make_data_url,
     get_image_mime_type,
     is_valid_image,
     get_image_paths_from_directory,
@@ -18,11 +20,17 @@ from src.utils.image_utils import (
 )
 from src.utils.file_utils import (
     ensure_directory,
+    dumps_json_bytes,
     read_json_file,
     write_json_file,
     get_unique_filename,
     is_valid_path,
 )
+from src.utils.recognition_cache import (
+    compute_cache_key,
+    load_cached_result,
+    store_cached_result,
+)
 
 
 class TestImageUtils:
@@ -86,6 +94,70 @@ class TestImageUtils:
         """Test encoding a nonexistent image raises error."""
         with pytest.raises(FileNotFoundError):
             encode_image_to_base64(temp_dir / "nonexistent.jpg")
+
+    def test_make_data_url(self, create_test_image):
+        """Test building a data URL matches prefix + whole-file encoding."""
+        image_path = create_test_image("test.jpg")
+        result = make_data_url(image_path)
+
+        expected = f"data:image/jpeg;base64,{encode_image_to_base64(image_path)}"
+        assert result == expected
+
+    def test_make_data_url_streams_in_chunks(self, temp_dir):
+        """Test chunked encoding is correct for payloads larger than one chunk."""
+        from src.utils.image_utils import ENCODE_CHUNK_SIZE
+
+        image_path = temp_dir / "big.png"
+        payload = bytes(range(256)) * (ENCODE_CHUNK_SIZE // 256 + 16)
+        image_path.write_bytes(payload)
+
+        result = make_data_url(image_path)
+
+        import base64
+        prefix, encoded = result.split("base64,", 1)
+        assert prefix == "data:image/png;"
+        assert base64.b64decode(encoded) == payload
+
+    def test_make_data_url_downscales_large_images(self, temp_dir):
+        """Test oversized photos are re-encoded as bounded JPEGs."""
+        Image = pytest.importorskip("PIL.Image")
+        import base64
+        import os
+
+        from src.utils.image_utils import DOWNSCALE_MIN_BYTES, MAX_IMAGE_SIDE
+
+        # Random noise compresses badly, so this stays above the size threshold
+        image_path = temp_dir / "photo.png"
+        image = Image.frombytes("RGB", (3000, 2000), os.urandom(3000 * 2000 * 3))
+        image.save(image_path, format="PNG")
+        assert image_path.stat().st_size >= DOWNSCALE_MIN_BYTES
+
+        result = make_data_url(image_path)
+
+        prefix, encoded = result.split("base64,", 1)
+        assert prefix == "data:image/jpeg;"
+        downscaled = Image.open(io.BytesIO(base64.b64decode(encoded)))
+        assert downscaled.format == "JPEG"
+        assert max(downscaled.size) <= MAX_IMAGE_SIDE
+
+    def test_make_data_url_keeps_small_images_unchanged(self, temp_dir):
+        """Test small files are sent as-is without recompression."""
+        Image = pytest.importorskip("PIL.Image")
+        import base64
+
+        image_path = temp_dir / "small.png"
+        Image.new("RGB", (100, 100), "white").save(image_path, format="PNG")
+
+        result = make_data_url(image_path)
+
+        prefix, encoded = result.split("base64,", 1)
+        assert prefix == "data:image/png;"
+        assert base64.b64decode(encoded) == image_path.read_bytes()
+
+    def test_make_data_url_nonexistent_image(self, temp_dir):
+        """Test data URL for a nonexistent image raises error."""
+        with pytest.raises(FileNotFoundError):
+            make_data_url(temp_dir / "nonexistent.jpg")
     
     def test_get_image_paths_from_directory(self, temp_dir, create_test_image):
         """Test getting image paths from a directory."""
@@ -212,3 +284,74 @@ class TestFileUtils:
         """Test path validation with Path object."""
         assert is_valid_path(temp_dir) is True
         assert is_valid_path(temp_dir / "subdir") is True
+
+    def test_dumps_json_bytes_roundtrip(self):
+        """Test serialized bytes parse back to the original data."""
+        data = {"multiple_choice": [{"title": "这是一道选择题"}], "count": 1}
+
+        for pretty in (True, False):
+            result = dumps_json_bytes(data, pretty=pretty)
+            assert isinstance(result, bytes)
+            assert json.loads(result) == data
+
+    def test_dumps_json_bytes_keeps_non_ascii(self):
+        """Test non-ASCII characters are not escaped."""
+        result = dumps_json_bytes({"title": "判断题"}, pretty=False)
+        assert "判断题".encode("utf-8") in result
+
+
+class TestRecognitionCache:
+    """Tests for the content-addressed recognition cache."""
+
+    def test_cache_key_is_stable(self, temp_dir):
+        """Same content and parameters produce the same key."""
+        image = temp_dir / "a.jpg"
+        image.write_bytes(b"image bytes")
+
+        key1 = compute_cache_key([str(image)], "mixed", "model-x")
+        key2 = compute_cache_key([str(image)], "mixed", "model-x")
+
+        assert key1 == key2
+
+    def test_cache_key_depends_on_content_type_and_model(self, temp_dir):
+        """Changing image bytes, question type, or model changes the key."""
+        image = temp_dir / "a.jpg"
+        image.write_bytes(b"image bytes")
+
+        base_key = compute_cache_key([str(image)], "mixed", "model-x")
+
+        assert compute_cache_key([str(image)], "true_false", "model-x") != base_key
+        assert compute_cache_key([str(image)], "mixed", "model-y") != base_key
+
+        image.write_bytes(b"different bytes")
+        assert compute_cache_key([str(image)], "mixed", "model-x") != base_key
+
+    def test_cache_key_is_path_order_independent(self, temp_dir):
+        """Image path order does not affect the key."""
+        a = temp_dir / "a.jpg"
+        b = temp_dir / "b.jpg"
+        a.write_bytes(b"first")
+        b.write_bytes(b"second")
+
+        assert (
+            compute_cache_key([str(a), str(b)], "mixed", "m")
+            == compute_cache_key([str(b), str(a)], "mixed", "m")
+        )
+
+    def test_store_and_load_roundtrip(self, temp_dir):
+        """Stored results come back unchanged; misses return None."""
+        cache_dir = temp_dir / "cache"
+        result = {"type": "mixed", "multiple_choice": [], "true_false": []}
+
+        assert load_cached_result("missing", cache_dir) is None
+
+        store_cached_result("some-key", result, cache_dir)
+        assert load_cached_result("some-key", cache_dir) == result
+
+    def test_load_corrupt_entry_is_a_miss(self, temp_dir):
+        """A corrupt cache file is treated as a cache miss."""
+        cache_dir = temp_dir / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "bad-key.json").write_text("not json", encoding="utf-8")
+
+        assert load_cached_result("bad-key", cache_dir) is None